@@ -4,15 +4,33 @@ Professional xmrig mining control daemon
 Onyx Digital Intelligence Development
 """
 
+import importlib
+
 from .config import ConfigManager, MiningConfig
-from .state import MinerState, MiningMode, SystemInfo
-from .controller import XMrigController
-from .server import DaemonServer, IPCServer, setup_logging
+
+# Heavier modules (psutil, subprocess, threading) load on first attribute access
+_LAZY_ATTRS = {
+    'MinerState': '.state',
+    'MiningMode': '.state',
+    'SystemInfo': '.state',
+    'XMrigController': '.controller',
+    'DaemonServer': '.server',
+    'IPCServer': '.server',
+    'setup_logging': '.server',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __version__ = "1.0.0"
 __all__ = [
     'ConfigManager',
-    'MiningConfig', 
+    'MiningConfig',
     'MinerState',
     'MiningMode',
     'SystemInfo',
@@ -20,4 +38,4 @@ __all__ = [
     'DaemonServer',
     'IPCServer',
     'setup_logging'
-]
\ No newline at end of file
+]
@@ -5,14 +5,78 @@ Onyx Digital Intelligence Development
 """
 
 import os
+import re
 import json
 import logging
 from pathlib import Path
 from typing import Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
+
+try:
+    import orjson
+except ImportError:  # Optional C accelerator - fall back to stdlib json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from bytes or str (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Resolved once; created lazily by ConfigManager.ensure_config_dir
+_CONFIG_DIR = Path.home() / ".onyx_monero"
+
+# Static xmrig config, serialized once; "__NAME__" strings are filled per start
+_XMRIG_TEMPLATE = json_dumps({
+    "autosave": True,
+    "cpu": {
+        "enabled": True,
+        "huge-pages": True,
+        "hw-aes": None,
+        "priority": "__PRIORITY__",
+        "max-threads-hint": "__THREADS__"
+    },
+    "pools": [
+        {
+            "url": "__POOL_URL__",
+            "user": "__WALLET__",
+            "pass": "__WORKER__",
+            "keepalive": True,
+            "tls": "__TLS__"
+        }
+    ],
+    "version": "6.21.0",
+    "background": False,
+    "colors": True,
+    "donate-level": 1,
+    # xmrig.log is written by the controller from captured stdout
+    "log-file": None,
+    "api": {
+        "id": None,
+        "worker-id": "__WORKER__"
+    }
+}, indent=True)
+_XMRIG_FIELD_RE = re.compile(rb'"__([A-Z_]+)__"')
+
+def write_file_atomic(path: Path, payload: bytes, mode: int = 0o600):
+    """Write payload with a single write() + fsync, then atomically replace path"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, mode)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
 @dataclass
 class MiningConfig:
     """Mining configuration structure"""
@@ -42,23 +106,40 @@ class ConfigManager:
     """Configuration file management"""
     
     def __init__(self):
-        self.config_dir = Path.home() / ".onyx_monero"
+        self.config_dir = _CONFIG_DIR
         self.config_file = self.config_dir / "config.json"
-        self.config_dir.mkdir(exist_ok=True, mode=0o700)
         
+        # Parsed config cache keyed by (st_mtime_ns, st_size)
+        self._cache: Optional[tuple[tuple[int, int], MiningConfig]] = None
+        
+    def _stat_key(self) -> Optional[tuple[int, int]]:
+        """Get cache key for the config file, or None if missing"""
+        try:
+            st = self.config_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
     def load_config(self) -> MiningConfig:
         """Load configuration from file"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
-                    
-                config = MiningConfig(**data)
-                logger.info(f"Loaded configuration: {config.profile_name}")
-                return config
-            else:
+            key = self._stat_key()
+            if key is None:
+                self._cache = None
                 logger.info("No config file found, using defaults")
                 return MiningConfig()
+            
+            # Serve unchanged file from cache (copy so callers can mutate)
+            if self._cache and self._cache[0] == key:
+                return replace(self._cache[1])
+            
+            with open(self.config_file, 'rb') as f:
+                data = json_loads(f.read())
+                
+            config = MiningConfig(**data)
+            self._cache = (key, replace(config))
+            logger.info(f"Loaded configuration: {config.profile_name}")
+            return config
                 
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
@@ -73,15 +154,22 @@ class ConfigManager:
                 logger.error(f"Invalid config: {error}")
                 return False
             
-            # Ensure config directory exists
-            self.config_dir.mkdir(exist_ok=True, mode=0o700)
+            # Invalidate cache before touching the file
+            self._cache = None
             
-            # Write config file with secure permissions
-            with open(self.config_file, 'w') as f:
-                json.dump(asdict(config), f, indent=2)
+            # Write config file with secure permissions (only owner can read/write)
+            payload = json_dumps(asdict(config), indent=True)
+            try:
+                write_file_atomic(self.config_file, payload)
+            except FileNotFoundError:
+                # Config directory missing - create it and retry once
+                self.ensure_config_dir()
+                write_file_atomic(self.config_file, payload)
             
-            # Set secure permissions (only owner can read/write)
-            os.chmod(self.config_file, 0o600)
+            # Repopulate cache from the in-memory config
+            key = self._stat_key()
+            if key is not None:
+                self._cache = (key, replace(config))
             
             logger.info(f"Configuration saved: {config.profile_name}")
             return True
@@ -90,6 +178,10 @@ class ConfigManager:
             logger.error(f"Failed to save config: {e}")
             return False
     
+    def ensure_config_dir(self):
+        """Create the config directory if it doesn't exist"""
+        self.config_dir.mkdir(exist_ok=True, mode=0o700)
+    
     def get_xmrig_config_path(self) -> Path:
         """Get path for xmrig configuration"""
         return self.config_dir / "xmrig-runtime.json"
@@ -98,42 +190,29 @@ class ConfigManager:
         """Get daemon socket path"""
         return self.config_dir / "daemon.sock"
     
-    def generate_xmrig_config(self, config: MiningConfig, threads: int, priority: int) -> dict:
-        """Generate xmrig configuration"""
-        return {
-            "autosave": True,
-            "cpu": {
-                "enabled": True,
-                "huge-pages": True,
-                "hw-aes": None,
-                "priority": priority,
-                "max-threads-hint": threads
-            },
-            "pools": [
-                {
-                    "url": config.pool_url,
-                    "user": config.wallet_address,
-                    "pass": config.worker_name,
-                    "keepalive": True,
-                    "tls": config.use_ssl
-                }
-            ],
-            "version": "6.21.0",
-            "background": False,
-            "colors": True,
-            "donate-level": 1,
-            "log-file": str(self.config_dir / "xmrig.log"),
-            "api": {
-                "id": None,
-                "worker-id": config.worker_name
-            }
+    def generate_xmrig_config(self, config: MiningConfig, threads: int, priority: int) -> bytes:
+        """Generate serialized xmrig configuration"""
+        values = {
+            b"PRIORITY": priority,
+            b"THREADS": threads,
+            b"POOL_URL": config.pool_url,
+            b"WALLET": config.wallet_address,
+            b"WORKER": config.worker_name,
+            b"TLS": config.use_ssl,
         }
+        # Single pass so user-supplied values are never re-scanned for placeholders
+        return _XMRIG_FIELD_RE.sub(
+            lambda m: json_dumps(values[m.group(1)]),
+            _XMRIG_TEMPLATE
+        )
     
     def create_default_config_if_missing(self) -> MiningConfig:
         """Create default config file if it doesn't exist"""
         if not self.config_file.exists():
             default_config = MiningConfig()
-            self.save_config(default_config)
-            logger.info("Created default configuration file")
+            if self.save_config(default_config):
+                logger.info("Created default configuration file")
+                # Already in memory and cached - skip re-reading it
+                return default_config
         
         return self.load_config()
\ No newline at end of file
@@ -4,23 +4,39 @@ Manages xmrig process lifecycle, monitoring, and cleanup
 Onyx Digital Intelligence Development
 """
 
+import io
 import os
-import json
+import re
+import shutil
 import signal
 import subprocess
+import sys
 import threading
-import time
 import logging
+import psutil
 from pathlib import Path
 from typing import Optional, Callable
 from .state import MinerState, MiningMode, SystemInfo
-from .config import ConfigManager, MiningConfig
+from .config import ConfigManager, MiningConfig, write_file_atomic
 
 logger = logging.getLogger(__name__)
 
+# Without preexec_fn, Popen can use vfork/posix_spawn instead of fork
+if sys.version_info >= (3, 11):
+    _NEW_PROCESS_GROUP = {"process_group": 0}
+else:
+    _NEW_PROCESS_GROUP = {"start_new_session": True}
+
+# xmrig availability probe results keyed by (path, st_mtime_ns, st_size)
+_XMRIG_AVAIL_CACHE: dict[tuple[str, int, int], bool] = {}
+
 class XMrigController:
     """XMrig process management and monitoring"""
     
+    # Example: "speed 10s/60s/15m 1234.5 1245.6 1250.0 H/s max 1300.0 H/s"
+    _HR_RE = re.compile(rb'speed.*?(\d+(?:\.\d+)?)\s*H/s', re.IGNORECASE)
+    _ERR_RE = re.compile(rb'error', re.IGNORECASE)
+    
     def __init__(self, state: MinerState, config_manager: ConfigManager):
         self.state = state
         self.config_manager = config_manager
@@ -28,15 +44,38 @@ class XMrigController:
         self.monitor_thread: Optional[threading.Thread] = None
         self.stop_monitoring = threading.Event()
         
+        # Buffered xmrig.log writer; the lock guards swapping it against
+        # writes and flushes. One flusher thread runs for the controller's life
+        self._log_fp: Optional[io.BufferedWriter] = None
+        self._log_lock = threading.Lock()
+        self._log_flusher: Optional[threading.Thread] = None
+        self._log_flusher_stop = threading.Event()
+        
         # Ensure xmrig is available
         if not self._check_xmrig_available():
             self.state.set_error("XMrig not found in PATH")
     
     def _check_xmrig_available(self) -> bool:
         """Check if xmrig is available in PATH"""
+        xmrig_path = shutil.which("xmrig")
+        if not xmrig_path:
+            logger.error("XMrig not available: not found in PATH")
+            return False
+        
+        try:
+            st = os.stat(xmrig_path)
+        except OSError as e:
+            logger.error(f"XMrig not available: {e}")
+            return False
+        
+        # Skip the --version spawn if this binary was already probed
+        key = (xmrig_path, st.st_mtime_ns, st.st_size)
+        if key in _XMRIG_AVAIL_CACHE:
+            return _XMRIG_AVAIL_CACHE[key]
+        
         try:
             result = subprocess.run(
-                ["xmrig", "--version"],
+                [xmrig_path, "--version"],
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -44,13 +83,16 @@ class XMrigController:
             if result.returncode == 0:
                 version_line = result.stdout.split('\n')[0] if result.stdout else "unknown"
                 logger.info(f"XMrig available: {version_line}")
-                return True
+                available = True
             else:
                 logger.error("XMrig version check failed")
-                return False
+                available = False
         except (subprocess.TimeoutExpired, FileNotFoundError) as e:
             logger.error(f"XMrig not available: {e}")
             return False
+        
+        _XMRIG_AVAIL_CACHE[key] = available
+        return available
     
     def start_mining(self, mode: MiningMode, config: MiningConfig) -> bool:
         """Start mining with specified mode"""
@@ -73,24 +115,39 @@ class XMrigController:
         
         # Generate xmrig config
         xmrig_config = self.config_manager.generate_xmrig_config(config, threads, priority)
-        config_path = self.config_manager.get_xmrig_config_path()
+        config_fd: Optional[int] = None
+        log_fp: Optional[io.BufferedWriter] = None
+        process: Optional[subprocess.Popen] = None
         
         try:
-            # Write xmrig config file
-            with open(config_path, 'w') as f:
-                json.dump(xmrig_config, f, indent=2)
-            os.chmod(config_path, 0o600)  # Secure permissions
+            # Open xmrig log first, so a failure here never leaves xmrig
+            # running without a monitor reading its output
+            log_fp = self._open_xmrig_log()
+            
+            if hasattr(os, "memfd_create"):
+                # Hand xmrig an in-memory config instead of a file on disk
+                config_fd = os.memfd_create("xmrig-config", os.MFD_CLOEXEC)
+                os.write(config_fd, xmrig_config)
+                config_arg = f"/proc/self/fd/{config_fd}"
+                pass_fds = (config_fd,)
+            else:
+                # Write xmrig config file (created 0600 by write_file_atomic)
+                config_path = self.config_manager.get_xmrig_config_path()
+                write_file_atomic(config_path, xmrig_config)
+                config_arg = str(config_path)
+                pass_fds = ()
             
             # Start xmrig process
-            cmd = ["xmrig", "--config", str(config_path)]
+            cmd = ["xmrig", "--config", config_arg]
             
-            self.xmrig_process = subprocess.Popen(
+            process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                preexec_fn=os.setsid  # Create new process group
+                pass_fds=pass_fds,
+                **_NEW_PROCESS_GROUP  # Own process group for killpg
             )
+            self.xmrig_process = process
             
             # Update state
             self.state.start_mining(mode, self.xmrig_process.pid, threads)
@@ -99,6 +156,7 @@ class XMrigController:
             self.stop_monitoring.clear()
             self.monitor_thread = threading.Thread(
                 target=self._monitor_xmrig,
+                args=(self.xmrig_process, log_fp),
                 daemon=True
             )
             self.monitor_thread.start()
@@ -107,9 +165,25 @@ class XMrigController:
             return True
             
         except Exception as e:
+            if process is not None:
+                # Spawned but not monitored: don't leave it mining unseen
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                process.wait()
+                process.stdout.close()
+                self.xmrig_process = None
+                self.state.stop_mining("Failed to start")
+            if log_fp is not None:
+                self._close_xmrig_log(log_fp)
             self.state.set_error(f"Failed to start xmrig: {e}")
             logger.error(f"Failed to start xmrig: {e}")
             return False
+        finally:
+            # xmrig holds its own copy of the memfd
+            if config_fd is not None:
+                os.close(config_fd)
     
     def _quick_stop_mining(self, reason: str = "Quick stop") -> bool:
         """Quick stop mining process without waiting for graceful shutdown"""
@@ -135,12 +209,15 @@ class XMrigController:
                     # Process already dead
                     logger.info(f"XMrig PID {pid} already terminated")
                 
+                # The monitor sees EOF once the kill lands and closes stdout
                 self.xmrig_process = None
             
             # Wait for monitor thread to finish (short timeout for quick stop)
             if self.monitor_thread and self.monitor_thread.is_alive():
                 self.monitor_thread.join(timeout=0.5)
             
+            self._close_xmrig_log()
+            
             # Update state
             self.state.stop_mining(reason)
             
@@ -162,6 +239,9 @@ class XMrigController:
             # Signal monitoring thread to stop
             self.stop_monitoring.set()
             
+            # Set once SIGTERM reached xmrig's process group
+            killpg_ok = False
+            
             # Terminate xmrig process
             if self.xmrig_process:
                 pid = self.xmrig_process.pid
@@ -169,6 +249,7 @@ class XMrigController:
                 try:
                     # Try graceful shutdown first
                     os.killpg(os.getpgid(pid), signal.SIGTERM)
+                    killpg_ok = True
                     
                     # Wait for graceful shutdown
                     try:
@@ -184,15 +265,20 @@ class XMrigController:
                     # Process already dead
                     logger.info(f"XMrig PID {pid} already terminated")
                 
+                # The monitor sees EOF once the kill lands and closes stdout
                 self.xmrig_process = None
             
-            # Cleanup any orphaned xmrig processes
-            self._cleanup_orphaned_processes()
+            # killpg reaches every child in xmrig's session; only scan for
+            # orphans when the group was already gone before we signalled it
+            if not killpg_ok:
+                self._cleanup_orphaned_processes()
             
             # Wait for monitor thread to finish
             if self.monitor_thread and self.monitor_thread.is_alive():
                 self.monitor_thread.join(timeout=2)
             
+            self._close_xmrig_log()
+            
             # Update state
             self.state.stop_mining(reason)
             
@@ -242,82 +328,113 @@ class XMrigController:
         
         return status
     
-    def _monitor_xmrig(self):
+    def _monitor_xmrig(self, process: subprocess.Popen, log_fp: io.BufferedWriter):
         """Monitor xmrig process output and status"""
-        if not self.xmrig_process or not self.xmrig_process.stdout:
+        if not process.stdout:
             return
         
         logger.info("Started xmrig monitoring thread")
         
         try:
-            while not self.stop_monitoring.is_set() and self.xmrig_process:
-                # Check if process is still alive
-                if self.xmrig_process.poll() is not None:
-                    self.state.stop_mining("Process terminated unexpectedly")
+            # Blocks until a line arrives; EOF comes only once every writer
+            # (xmrig and anything it spawned) has exited or been killed
+            for line in iter(process.stdout.readline, b''):
+                if self.stop_monitoring.is_set():
                     break
+                line = line.strip()
+                if line:
+                    self._process_xmrig_output(line)
+            
+            # Only report if this process wasn't replaced by a mode switch
+            if not self.stop_monitoring.is_set() and self.xmrig_process is process:
+                self.state.stop_mining("Process terminated unexpectedly")
                 
-                # Read output with timeout
-                try:
-                    # Use select/poll for non-blocking read with timeout
-                    import select
-                    if select.select([self.xmrig_process.stdout], [], [], 1):
-                        line = self.xmrig_process.stdout.readline()
-                        if line:
-                            line = line.strip()
-                            if line:
-                                self._process_xmrig_output(line)
-                    
-                except Exception as e:
-                    logger.error(f"Error reading xmrig output: {e}")
-                    break
-                
-                # Brief sleep to prevent excessive CPU usage
-                time.sleep(0.1)
-                
+        except (ValueError, OSError) as e:
+            logger.debug(f"XMrig output stream error: {e}")
         except Exception as e:
             logger.error(f"XMrig monitoring error: {e}")
             self.state.set_error(f"Monitoring error: {e}")
+        finally:
+            # This thread is the pipe's only reader, so it closes it - closing
+            # from a stop path would block on the lock readline() holds
+            process.stdout.close()
+            # Output is over - close the log unless a newer run replaced it
+            self._close_xmrig_log(log_fp)
         
         logger.info("XMrig monitoring thread stopped")
     
-    def _process_xmrig_output(self, line: str):
-        """Process xmrig output line and extract information"""
-        # Add to log buffer
-        self.state.add_log(line)
+    def _open_xmrig_log(self) -> io.BufferedWriter:
+        """Open buffered xmrig.log writer and make sure the flusher runs"""
+        self._close_xmrig_log()
+        log_path = self.config_manager.config_dir / "xmrig.log"
+        log_fp = open(log_path, 'ab', buffering=65536)
+        with self._log_lock:
+            self._log_fp = log_fp
+        
+        if self._log_flusher is None:
+            self._log_flusher = threading.Thread(
+                target=self._flush_xmrig_log, name="xmrig-log-flush", daemon=True
+            )
+            self._log_flusher.start()
+        return log_fp
+    
+    def _flush_xmrig_log(self):
+        """Flush xmrig.log once per second until shutdown"""
+        while not self._log_flusher_stop.wait(1.0):
+            with self._log_lock:
+                log_fp = self._log_fp
+                if log_fp is None:
+                    continue
+                try:
+                    log_fp.flush()
+                except (ValueError, OSError) as e:
+                    logger.debug(f"Error flushing xmrig log: {e}")
+    
+    def _close_xmrig_log(self, expected: Optional[io.BufferedWriter] = None):
+        """Flush and close xmrig.log (only if it is still expected, when given)"""
+        with self._log_lock:
+            log_fp = self._log_fp
+            if log_fp is None or (expected is not None and log_fp is not expected):
+                return
+            self._log_fp = None
+        
+        try:
+            log_fp.close()
+        except Exception as e:
+            logger.debug(f"Error closing xmrig log: {e}")
+    
+    def _process_xmrig_output(self, line: bytes):
+        """Process raw xmrig output line and extract information"""
+        # Persist to xmrig.log (buffered) and add to log buffer
+        with self._log_lock:
+            log_fp = self._log_fp
+            if log_fp is not None:
+                log_fp.write(line + b'\n')
+        text = line.decode('utf-8', 'replace')
         
         # Extract hashrate if present
-        if "speed" in line.lower() and "h/s" in line.lower():
-            try:
-                # Parse hashrate from typical xmrig output
-                # Example: "speed 10s/60s/15m 1234.5 1245.6 1250.0 H/s max 1300.0 H/s"
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if "h/s" in part.lower() and i > 0:
-                        # Try to find the hashrate value before "H/s"
-                        potential_hashrate = parts[i-1]
-                        try:
-                            float(potential_hashrate)  # Validate it's a number
-                            self.state.update_hashrate(f"{potential_hashrate} H/s")
-                            break
-                        except ValueError:
-                            continue
-            except Exception as e:
-                logger.debug(f"Failed to parse hashrate from: {line}")
+        hashrate = None
+        match = self._HR_RE.search(line)
+        if match:
+            hashrate = f"{match.group(1).decode('ascii')} H/s"
         
         # Check for errors
-        if any(keyword in line.lower() for keyword in ["error", "failed", "cannot", "unable"]):
-            if "error" in line.lower():
-                self.state.set_error(f"XMrig error: {line}")
+        error = f"XMrig error: {text}" if self._ERR_RE.search(line) else None
+        
+        self.state.apply_xmrig_line(text, hashrate, error)
     
     def _cleanup_orphaned_processes(self):
         """Clean up any orphaned xmrig processes"""
+        own_pid = os.getpid()
         try:
-            # Use pkill to clean up any remaining xmrig processes
-            subprocess.run(
-                ["pkill", "-f", "xmrig"],
-                capture_output=True,
-                timeout=5
-            )
+            for proc in psutil.process_iter(['name']):
+                if proc.info['name'] != "xmrig" or proc.pid == own_pid:
+                    continue
+                try:
+                    os.kill(proc.pid, signal.SIGKILL)
+                    logger.info(f"Killed orphaned xmrig PID {proc.pid}")
+                except (ProcessLookupError, PermissionError):
+                    pass
         except Exception as e:
             logger.debug(f"Could not clean up orphaned processes: {e}")
     
@@ -325,10 +442,14 @@ class XMrigController:
         """Shutdown controller and cleanup resources"""
         logger.info("Shutting down XMrig controller")
         
-        if self.is_mining():
-            self.stop_mining("Daemon shutdown")
+        # Clean up any remaining processes unless we just stopped cleanly
+        if not (self.is_mining() and self.stop_mining("Daemon shutdown")):
+            self._cleanup_orphaned_processes()
+        self._close_xmrig_log()
         
-        # Clean up any remaining processes
-        self._cleanup_orphaned_processes()
+        self._log_flusher_stop.set()
+        if self._log_flusher is not None:
+            self._log_flusher.join(timeout=2)
+            self._log_flusher = None
         
         logger.info("XMrig controller shutdown complete")
\ No newline at end of file
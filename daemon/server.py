@@ -6,19 +6,83 @@ Onyx Digital Intelligence Development
 
 import os
 import json
+import select
 import socket
+import selectors
 import threading
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
-from .state import MinerState, MiningMode
-from .config import ConfigManager, MiningConfig
+from typing import Dict, Any, Optional, Callable, Union
+from .state import MinerState, MiningMode, SystemInfo, LOG_CAPACITY
+from .config import ConfigManager, MiningConfig, json_dumps, json_loads
 from .controller import XMrigController
 
 logger = logging.getLogger(__name__)
 
+# Socket buffer size so a full request/response fits one read/write
+IPC_BUFFER_SIZE = 65536
+
+# Frames are a 4-byte big-endian length followed by a JSON payload
+FRAME_HEADER_SIZE = 4
+MAX_FRAME_SIZE = 1 << 20
+
+# Idle connections are closed after CLIENT_IDLE_TIMEOUT seconds, checked every
+# IDLE_SWEEP_INTERVAL; once a frame starts, the rest must arrive within
+# FRAME_READ_TIMEOUT
+CLIENT_IDLE_TIMEOUT = 30
+IDLE_SWEEP_INTERVAL = 5
+FRAME_READ_TIMEOUT = 5
+
+# Constant ping reply, and the request encodings matched before JSON parsing
+_PING_RESPONSE = json_dumps({"ok": True, "message": "pong", "daemon_version": "1.0.0"})
+_PING_REQUESTS = (b'{"cmd": "ping"}', b'{"cmd":"ping"}')
+
+# Read-only commands that may be combined in one bundle request
+_BUNDLE_COMMANDS = frozenset({"status", "config_get", "system_info", "ping"})
+
+# MiningConfig fields accepted by config_set, with the type each value must have
+_CFG_FIELDS = (
+    ("wallet_address", str),
+    ("pool_url", str),
+    ("worker_name", str),
+    ("use_ssl", bool),
+    ("profile_name", str),
+)
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Read exactly size bytes, or None if the peer closed first"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            return None
+        received += n
+    return buffer
+
+def _peer_closed(sock: socket.socket, poller: select.poll) -> bool:
+    """True if the peer has hung up; poller must watch sock for POLLIN"""
+    if not poller.poll(0):
+        return False
+    # Readable: either pending data or EOF - peek to tell them apart
+    try:
+        return sock.recv(1, socket.MSG_PEEK) == b""
+    except OSError:
+        return True
+
+def _tune_socket_buffers(sock: socket.socket):
+    """Set send/receive buffer sizes on an IPC socket"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, IPC_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, IPC_BUFFER_SIZE)
+
 class IPCServer:
     """Unix domain socket IPC server"""
     
@@ -29,7 +93,26 @@ class IPCServer:
         self.socket_path = config_manager.get_socket_path()
         self.server_socket: Optional[socket.socket] = None
         self.running = False
-        self.client_threads = []
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.accept_thread: Optional[threading.Thread] = None
+        
+        # Open persistent client connections, shut down by stop()
+        self._clients: set[socket.socket] = set()
+        self._clients_lock = threading.Lock()
+        
+        # Idle connections wait in the selector rather than on a worker,
+        # mapped to the monotonic time they went idle (accept thread only)
+        self._idle: Dict[socket.socket, float] = {}
+        # Connections a worker has finished a frame on, re-armed by the accept thread
+        self._ready: deque = deque()
+        
+        # Single worker so start/stop requests run one at a time, in order
+        self._control_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ctl")
+        
+        # Readiness selector over the listener and a shutdown wake pipe
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
         
         # Command handlers
         self.handlers = {
@@ -39,31 +122,48 @@ class IPCServer:
             "config_get": self._handle_config_get,
             "config_set": self._handle_config_set,
             "system_info": self._handle_system_info,
-            "ping": self._handle_ping
+            "ping": self._handle_ping,
+            "bundle": self._handle_bundle
         }
+        self._dispatch = self.handlers.get
     
     def start(self) -> bool:
         """Start IPC server"""
         try:
+            # Socket lives in the config directory
+            self.config_manager.ensure_config_dir()
+            
             # Remove existing socket file if it exists
             if self.socket_path.exists():
                 self.socket_path.unlink()
                 
             # Create server socket
             self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            _tune_socket_buffers(self.server_socket)
             self.server_socket.bind(str(self.socket_path))
             
             # Set socket permissions (owner read/write only)
             os.chmod(self.socket_path, 0o600)
             
             self.server_socket.listen(5)
+            self.server_socket.setblocking(False)
+            
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_w, False)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.server_socket, selectors.EVENT_READ)
+            self._selector.register(self._wake_r, selectors.EVENT_READ)
+            
             self.running = True
             
+            # Bounded worker pool, busy only while a request frame is served
+            self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ipc")
+            
             logger.info(f"IPC server listening on {self.socket_path}")
             
             # Start accept thread
-            accept_thread = threading.Thread(target=self._accept_connections, daemon=True)
-            accept_thread.start()
+            self.accept_thread = threading.Thread(target=self._accept_connections, daemon=True)
+            self.accept_thread.start()
             
             return True
             
@@ -77,7 +177,11 @@ class IPCServer:
         
         self.running = False
         
-        # Close server socket
+        # Wake the accept loop and let it exit on its own
+        self._wake()
+        if self.accept_thread and self.accept_thread.is_alive():
+            self.accept_thread.join(timeout=1)
+        
         if self.server_socket:
             try:
                 self.server_socket.close()
@@ -91,111 +195,255 @@ class IPCServer:
         except Exception as e:
             logger.error(f"Error removing socket file: {e}")
         
-        # Wait for client threads to finish (with timeout)
-        for thread in self.client_threads:
-            if thread.is_alive():
-                thread.join(timeout=1)
+        # Unblock workers and subscribers still reading or writing
+        with self._clients_lock:
+            for client_socket in self._clients:
+                try:
+                    client_socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        
+        # Finish in-flight frames, drop queued ones
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self._control_executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Close idle, re-armed and never-served connections
+        with self._clients_lock:
+            for client_socket in self._clients:
+                client_socket.close()
+            self._clients.clear()
+        self._idle.clear()
+        self._ready.clear()
+        
+        # Close selector and wake pipe last - workers may still have woken it
+        if self._selector:
+            self._selector.close()
+            self._selector = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
         
         logger.info("IPC server stopped")
     
+    def _wake(self):
+        """Wake the accept loop (shutdown, or connections to re-arm)"""
+        if self._wake_w is None:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe already full - the loop is awake anyway
+        except OSError as e:
+            logger.error(f"Error waking accept loop: {e}")
+    
     def _accept_connections(self):
-        """Accept incoming connections"""
+        """Accept connections and hand readable clients to the worker pool"""
         while self.running:
             try:
-                client_socket, _ = self.server_socket.accept()
-                
-                # Handle client in separate thread
-                client_thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket,),
-                    daemon=True
-                )
-                client_thread.start()
-                self.client_threads.append(client_thread)
-                
-                # Clean up finished threads
-                self.client_threads = [t for t in self.client_threads if t.is_alive()]
-                
-            except OSError:
-                # Socket was closed
+                events = self._selector.select(timeout=IDLE_SWEEP_INTERVAL)
+            except OSError as e:
                 if self.running:
-                    logger.error("Server socket error")
+                    logger.error(f"Server selector error: {e}")
                 break
+            
+            for key, _ in events:
+                if key.fileobj is self.server_socket:
+                    self._drain_accept_queue()
+                elif key.fileobj == self._wake_r:
+                    os.read(self._wake_r, 4096)
+                    if not self.running:
+                        # Shutdown requested by stop()
+                        return
+                else:
+                    self._dispatch_client(key.fileobj)
+            
+            while self._ready:
+                self._watch_client(self._ready.popleft())
+            self._close_idle_clients()
+    
+    def _drain_accept_queue(self):
+        """Accept every pending connection for one readiness event"""
+        while True:
+            try:
+                client_socket, _ = self.server_socket.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if self.running:
+                    logger.error(f"Server socket error: {e}")
+                return
+            
+            try:
+                # Set frame read timeout and buffer sizes
+                client_socket.settimeout(FRAME_READ_TIMEOUT)
+                _tune_socket_buffers(client_socket)
+                with self._clients_lock:
+                    self._clients.add(client_socket)
+                self._watch_client(client_socket)
             except Exception as e:
                 logger.error(f"Error accepting connection: {e}")
+                self._close_client(client_socket)
+    
+    def _watch_client(self, client_socket: socket.socket):
+        """Park an idle connection in the selector until its next request"""
+        self._idle[client_socket] = time.monotonic()
+        self._selector.register(client_socket, selectors.EVENT_READ)
     
-    def _handle_client(self, client_socket: socket.socket):
-        """Handle individual client connection"""
+    def _dispatch_client(self, client_socket: socket.socket):
+        """Serve the frame now readable on a connection on the worker pool"""
+        self._selector.unregister(client_socket)
+        del self._idle[client_socket]
         try:
-            with client_socket:
-                # Set receive timeout
-                client_socket.settimeout(30)
-                
-                # Receive request
-                data = client_socket.recv(4096)
-                if not data:
-                    return
-                
-                try:
-                    request = json.loads(data.decode('utf-8'))
-                except json.JSONDecodeError as e:
-                    response = {"ok": False, "error": f"Invalid JSON: {e}"}
-                    self._send_response(client_socket, response)
-                    return
-                
-                # Process request
-                response = self._process_request(request)
-                self._send_response(client_socket, response)
-                
+            self.executor.submit(self._serve_client, client_socket)
+        except RuntimeError as e:
+            logger.error(f"Error dispatching client: {e}")
+            self._close_client(client_socket)
+    
+    def _close_idle_clients(self):
+        """Close connections that have been idle too long"""
+        cutoff = time.monotonic() - CLIENT_IDLE_TIMEOUT
+        expired = [sock for sock, since in self._idle.items() if since < cutoff]
+        for client_socket in expired:
+            del self._idle[client_socket]
+            self._selector.unregister(client_socket)
+            self._close_client(client_socket)
+        if expired:
+            logger.debug(f"Closed {len(expired)} idle client connection(s)")
+    
+    def _serve_client(self, client_socket: socket.socket):
+        """Serve one request frame, then hand the connection back to the selector"""
+        keep_open = False
+        try:
+            keep_open = self._serve_frame(client_socket)
         except socket.timeout:
-            logger.debug("Client connection timed out")
+            logger.debug("Client stalled mid-frame")
         except Exception as e:
             logger.error(f"Error handling client: {e}")
+        
+        if keep_open is None:
+            return  # Now owned by a subscriber thread
+        if keep_open and self.running:
+            self._ready.append(client_socket)
+            self._wake()
+        else:
+            self._close_client(client_socket)
+    
+    def _close_client(self, client_socket: socket.socket):
+        """Forget and close a client connection"""
+        with self._clients_lock:
+            self._clients.discard(client_socket)
+        client_socket.close()
     
-    def _send_response(self, client_socket: socket.socket, response: Dict[str, Any]):
-        """Send JSON response to client"""
+    def _serve_frame(self, client_socket: socket.socket) -> Optional[bool]:
+        """Read one request frame and answer it
+        
+        Returns True to keep the connection, False to close it, or None when
+        it was handed to another thread that now owns it.
+        """
+        header = _recv_exact(client_socket, FRAME_HEADER_SIZE)
+        if header is None:
+            return False
+        
+        length = int.from_bytes(header, "big")
+        if length > MAX_FRAME_SIZE:
+            # Can't resynchronise without reading the payload - reply and hang up
+            response = {"ok": False, "error": f"Request too large: {length} bytes"}
+            self._send_response(client_socket, response)
+            return False
+        
+        data = _recv_exact(client_socket, length)
+        if data is None:
+            return False
+        
+        # Health checks skip JSON decode and dispatch entirely
+        if data in _PING_REQUESTS:
+            self._send_response(client_socket, _PING_RESPONSE)
+            return True
+        
+        try:
+            request = json_loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            response = {"ok": False, "error": f"Invalid JSON: {e}"}
+            self._send_response(client_socket, response)
+            return True
+        
+        # Subscribers turn this connection into a one-way event stream on a
+        # dedicated thread, so they never hold one of the request workers
+        if isinstance(request, dict) and request.get("cmd") == "subscribe":
+            threading.Thread(
+                target=self._stream_events, args=(client_socket,),
+                name="ipc-events", daemon=True
+            ).start()
+            return None
+        
+        # Process request
+        response = self._process_request(request)
+        self._send_response(client_socket, response)
+        return True
+    
+    def _stream_events(self, client_socket: socket.socket):
+        """Push a state_change frame whenever the miner state revision moves"""
+        try:
+            rev = self.state.rev
+            self._send_response(client_socket, {"ok": True, "rev": rev})
+            
+            poller = select.poll()
+            poller.register(client_socket, select.POLLIN)
+            while self.running:
+                # Wake periodically so stop() and hung-up subscribers are noticed
+                new_rev = self.state.wait_for_change(rev, timeout=1.0)
+                if new_rev == rev:
+                    if _peer_closed(client_socket, poller):
+                        return
+                    continue
+                rev = new_rev
+                event = json_dumps({"evt": "state_change", "rev": rev})
+                client_socket.sendall(len(event).to_bytes(FRAME_HEADER_SIZE, "big") + event)
+        except OSError:
+            pass  # Subscriber went away
+        finally:
+            self._close_client(client_socket)
+    
+    def _send_response(self, client_socket: socket.socket, response: Union[Dict[str, Any], bytes]):
+        """Send framed JSON response to client (bytes are sent pre-encoded)"""
         try:
-            response_data = json.dumps(response).encode('utf-8')
-            client_socket.sendall(response_data)
+            if not isinstance(response, bytes):
+                response = json_dumps(response)
+            client_socket.sendall(len(response).to_bytes(FRAME_HEADER_SIZE, "big") + response)
         except Exception as e:
             logger.error(f"Error sending response: {e}")
     
-    def _process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_request(self, request: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
         """Process IPC request and return response"""
-        if not isinstance(request, dict) or "cmd" not in request:
+        cmd = request.get("cmd") if isinstance(request, dict) else None
+        if cmd is None:
             return {"ok": False, "error": "Missing 'cmd' field"}
         
-        cmd = request["cmd"]
-        if cmd not in self.handlers:
+        handler = self._dispatch(cmd) if isinstance(cmd, str) else None
+        if handler is None:
             return {"ok": False, "error": f"Unknown command: {cmd}"}
         
         try:
-            return self.handlers[cmd](request)
+            return handler(request)
         except Exception as e:
             logger.error(f"Error handling command '{cmd}': {e}")
             return {"ok": False, "error": f"Command failed: {e}"}
     
-    def _handle_status(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle status command - lock-free minimal response"""
-        try:
-            # Direct access to avoid deadlocks
-            mining_active = (self.state._mode != MiningMode.STOPPED and 
-                           self.state._xmrig_pid is not None)
-            return {
-                "ok": True,
-                "mining_active": mining_active,
-                "current_mode": self.state._mode.value if self.state._mode else "stopped",
-                "mining_threads": self.state._threads_active or 0,
-                "total_threads": self.state._total_threads or 72
-            }
-        except Exception as e:
-            return {
-                "ok": True,
-                "mining_active": False,
-                "current_mode": "stopped",
-                "mining_threads": 0,
-                "total_threads": 72
-            }
+    def _handle_status(self, request: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
+        """Handle status command - lock-free pre-encoded response, or a delta when asked"""
+        if "since" not in request and "log_from" not in request:
+            return self.state.status_bytes
+        
+        since = request.get("since")
+        log_from = request.get("log_from", 0)
+        log_lines = request.get("log_lines", LOG_CAPACITY)
+        if (not isinstance(log_from, int) or not isinstance(log_lines, int) or log_lines < 0
+                or (since is not None and not isinstance(since, int))):
+            return {"ok": False, "error": "'since', 'log_from' and 'log_lines' must be integers"}
+        return self.state.get_status_delta(since, log_from, log_lines)
     
     def _handle_start(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle start command"""
@@ -220,24 +468,26 @@ class IPCServer:
         if not valid:
             return {"ok": False, "error": f"Configuration error: {error}"}
         
-        # Start mining in thread to prevent blocking IPC response
-        import threading
-        def start_mining_async():
-            try:
-                success = self.controller.start_mining(mode, config)
-                if not success:
-                    logger.error(f"Failed to start {mode.value} mining")
-            except Exception as e:
-                logger.error(f"Error starting mining: {e}")
-        
-        thread = threading.Thread(target=start_mining_async, daemon=True)
-        thread.start()
+        # Start mining on the control worker to prevent blocking IPC response
+        self._control_executor.submit(self._start_mining_async, mode, config)
         
         return {"ok": True, "message": f"Starting {mode.value} mining..."}
     
+    def _start_mining_async(self, mode: MiningMode, config: MiningConfig):
+        """Start mining on the control worker"""
+        try:
+            success = self.controller.start_mining(mode, config)
+            if not success:
+                logger.error(f"Failed to start {mode.value} mining")
+        except Exception as e:
+            logger.error(f"Error starting mining: {e}")
+    
     def _handle_stop(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle stop command"""
-        success = self.controller.stop_mining("User requested via IPC")
+        # Queue behind any pending start so the two can't race
+        success = self._control_executor.submit(
+            self.controller.stop_mining, "User requested via IPC"
+        ).result()
         if success:
             return {"ok": True, "message": "Mining stopped"}
         else:
@@ -265,16 +515,12 @@ class IPCServer:
             current_config = self.config_manager.load_config()
             
             # Update fields if provided
-            if "wallet_address" in request:
-                current_config.wallet_address = request["wallet_address"]
-            if "pool_url" in request:
-                current_config.pool_url = request["pool_url"]
-            if "worker_name" in request:
-                current_config.worker_name = request["worker_name"]
-            if "use_ssl" in request:
-                current_config.use_ssl = bool(request["use_ssl"])
-            if "profile_name" in request:
-                current_config.profile_name = request["profile_name"]
+            for name, field_type in _CFG_FIELDS:
+                if name in request:
+                    value = request[name]
+                    if not isinstance(value, field_type):
+                        return {"ok": False, "error": f"'{name}' must be a {field_type.__name__}"}
+                    setattr(current_config, name, value)
             
             # Validate new config
             valid, error = current_config.is_valid()
@@ -293,32 +539,52 @@ class IPCServer:
     
     def _handle_system_info(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle system_info command"""
-        from .state import SystemInfo
-        
-        return {
-            "ok": True,
-            "cpu_info": SystemInfo.get_cpu_info(),
-            "memory_info": SystemInfo.get_memory_info(),
-            "thermal_info": SystemInfo.get_thermal_info()
-        }
+        return {"ok": True, **SystemInfo.get_system_info()}
     
-    def _handle_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_ping(self, request: Dict[str, Any]) -> bytes:
         """Handle ping command"""
-        return {
-            "ok": True,
-            "message": "pong",
-            "daemon_version": "1.0.0"
-        }
+        return _PING_RESPONSE
+    
+    def _handle_bundle(self, request: Dict[str, Any]) -> Union[Dict[str, Any], bytes]:
+        """Handle bundle command - run several read-only commands in one round trip"""
+        cmds = request.get("cmds")
+        if not isinstance(cmds, list) or not cmds:
+            return {"ok": False, "error": "'cmds' must be a non-empty list"}
+        
+        # Entries are command names or full request objects; results are keyed by name
+        sub_requests = {}
+        for entry in cmds:
+            sub_request = {"cmd": entry} if isinstance(entry, str) else entry
+            cmd = sub_request.get("cmd") if isinstance(sub_request, dict) else None
+            if not isinstance(cmd, str) or cmd not in _BUNDLE_COMMANDS:
+                return {"ok": False, "error": f"Command not allowed in bundle: {cmd}"}
+            sub_requests[cmd] = sub_request
+        
+        parts = []
+        for cmd, sub_request in sub_requests.items():
+            # Splice each result in as-is so pre-encoded responses aren't re-parsed
+            response = self._process_request(sub_request)
+            if not isinstance(response, bytes):
+                response = json_dumps(response)
+            parts.append(json_dumps(cmd) + b":" + response)
+        
+        return b'{"ok":true,"results":{' + b",".join(parts) + b"}}"
 
 class DaemonServer:
     """Main daemon server orchestrator"""
     
-    def __init__(self):
+    def __init__(self, log_listener: Optional[logging.handlers.QueueListener] = None):
+        self.log_listener = log_listener
         self.config_manager = ConfigManager()
         self.state = MinerState()
         self.controller = XMrigController(self.state, self.config_manager)
         self.ipc_server = IPCServer(self.config_manager, self.state, self.controller)
-        self.shutdown_event = threading.Event()
+        self.shutdown_requested = False
+        
+        # Signals write to this pipe, waking the main loop's blocking read
+        self._signal_r, self._signal_w = os.pipe()
+        os.set_blocking(self._signal_w, False)
+        signal.set_wakeup_fd(self._signal_w)
         
         # Setup signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -327,7 +593,7 @@ class DaemonServer:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down...")
-        self.shutdown_event.set()
+        self.shutdown_requested = True
     
     def start(self) -> bool:
         """Start daemon server"""
@@ -337,6 +603,9 @@ class DaemonServer:
             # Ensure configuration exists
             self.config_manager.create_default_config_if_missing()
             
+            # Sample CPU utilisation in the background for non-blocking system_info
+            SystemInfo.start_cpu_sampler()
+            
             # Stop any existing mining (cleanup from previous runs)
             if self.controller.is_mining():
                 self.controller.stop_mining("Daemon restart cleanup")
@@ -357,8 +626,12 @@ class DaemonServer:
     def run(self):
         """Run daemon main loop"""
         try:
-            # Wait for shutdown signal
-            self.shutdown_event.wait()
+            # Sleep in read() until a signal arrives on the wakeup fd
+            while not self.shutdown_requested:
+                try:
+                    os.read(self._signal_r, 64)
+                except InterruptedError:
+                    pass
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         finally:
@@ -369,34 +642,52 @@ class DaemonServer:
         logger.info("Shutting down Onyx Monero Daemon")
         
         try:
+            # Stop IPC server first: it stops taking requests and drains the
+            # control executor, so no queued start can spawn xmrig afterwards
+            self.ipc_server.stop()
+            
             # Stop mining
             self.controller.shutdown()
             
-            # Stop IPC server
-            self.ipc_server.stop()
+            # Stop background CPU sampling
+            SystemInfo.stop_cpu_sampler()
             
             logger.info("Daemon shutdown complete")
             
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
+        
+        # Flush queued records to disk last
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
 
-def setup_logging():
-    """Setup daemon logging"""
+def setup_logging() -> logging.handlers.QueueListener:
+    """Setup daemon logging, returning the started listener thread"""
     log_dir = Path.home() / ".onyx_monero"
     log_dir.mkdir(exist_ok=True, mode=0o700)
     
     log_file = log_dir / "daemon.log"
     
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+    # File and console output happen on the listener thread
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file)
+    stream_handler = logging.StreamHandler()
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+    
+    # Callers only enqueue records, so logging never blocks an IPC handler
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
     )
+    listener.start()
     
     # Set log file permissions
     if log_file.exists():
-        os.chmod(log_file, 0o600)
\ No newline at end of file
+        os.chmod(log_file, 0o600)
+    
+    return listener
\ No newline at end of file
@@ -4,86 +4,166 @@ Tracks mining state, logs, and system information
 Onyx Digital Intelligence Development
 """
 
+import os
+import math
 import logging
 import psutil
+import queue
 import time
-from collections import deque
-from threading import Lock
-from typing import Optional, List, Dict, Any
+from collections import namedtuple
+from functools import wraps
+from operator import attrgetter
+from threading import Condition, Event, Lock, Thread
+from typing import Optional, List, Dict, Any, Callable
 from enum import Enum
+from .config import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# CPU topology read once; sched_getaffinity honours cgroup/cpuset limits
+if hasattr(os, "sched_getaffinity"):
+    _TOTAL_THREADS = len(os.sched_getaffinity(0))
+else:
+    _TOTAL_THREADS = psutil.cpu_count(logical=True) or 1
+_PHYSICAL_CORES = psutil.cpu_count(logical=False)
+
+def _ttl_cache(ttl: float) -> Callable:
+    """Memoize a zero-argument function returning a dict for ttl seconds;
+    each caller gets its own shallow copy"""
+    def decorator(fn: Callable) -> Callable:
+        cache = {"expires": 0.0, "value": None}
+        lock = Lock()  # IPC workers call concurrently; one of them refreshes
+        
+        @wraps(fn)
+        def wrapper():
+            with lock:
+                if time.monotonic() >= cache["expires"]:
+                    cache["value"] = fn()
+                    cache["expires"] = time.monotonic() + ttl
+                return dict(cache["value"])
+        return wrapper
+    return decorator
+
+# (epoch second, "HH:MM:SS") of the last formatted log timestamp
+_timestamp_cache = (0, "")
+
+def _log_timestamp() -> str:
+    """Local HH:MM:SS, formatted at most once per wall-clock second"""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached_str = _timestamp_cache
+    if now != cached_second:
+        cached_str = time.strftime("%H:%M:%S", time.localtime(now))
+        _timestamp_cache = (now, cached_str)
+    return cached_str
+
+LOG_CAPACITY = 50
+
+CPU_SAMPLE_INTERVAL = 1.0  # Seconds per cpu_percent window
+
+# Utilisation over the sampler's last window (None before its first sample)
+_cpu_percent: Optional[float] = None
+_cpu_sampler: Optional[Thread] = None
+_cpu_sampler_stop = Event()
+
+def _sample_cpu_percent():
+    """Close a cpu_percent window every CPU_SAMPLE_INTERVAL until stopped"""
+    global _cpu_percent
+    while not _cpu_sampler_stop.wait(CPU_SAMPLE_INTERVAL):
+        _cpu_percent = psutil.cpu_percent(interval=None)
+
+_sensor_current = attrgetter('current')
+
 class MiningMode(Enum):
     """Mining operation modes"""
     STOPPED = "stopped"
     BACKGROUND = "background"  # ~50% threads, low priority
     MONEY_HUNTER = "money_hunter"  # ~75-80% threads, high priority
 
+# rev increases on every change so clients can skip unchanged status fields
+StateSnapshot = namedtuple(
+    "StateSnapshot",
+    "rev mode pid threads_active total_threads hashrate start_time last_error"
+)
+
 class MinerState:
     """Thread-safe miner state management"""
     
     def __init__(self):
+        # Writers serialize on the lock; readers load the immutable snapshot
         self._lock = Lock()
-        self._mode = MiningMode.STOPPED
-        self._xmrig_pid: Optional[int] = None
-        self._threads_active = 0
-        self._total_threads = psutil.cpu_count(logical=True)
-        self._log_buffer = deque(maxlen=50)  # Keep last 50 log lines
-        self._last_error: Optional[str] = None
-        self._start_time: Optional[float] = None
-        self._hashrate: Optional[str] = None
+        self._changed = Condition(self._lock)  # Notified on every new snapshot
+        self._snapshot = StateSnapshot(
+            # Seeded from the clock so revisions never repeat across daemon restarts
+            rev=time.monotonic_ns(),
+            mode=MiningMode.STOPPED,
+            pid=None,
+            threads_active=0,
+            total_threads=_TOTAL_THREADS,
+            hashrate=None,
+            start_time=None,
+            last_error=None
+        )
+        # Writers push to a lock-free inbox; it is folded into the ring of the
+        # last LOG_CAPACITY lines on read or once it grows past LOG_CAPACITY
+        self._log_inbox: queue.SimpleQueue = queue.SimpleQueue()
+        self._log_ring: List[str] = [""] * LOG_CAPACITY
+        self._log_head = 0  # Lines ever folded into the ring
         
-        logger.info(f"Initialized miner state - {self._total_threads} CPU threads available")
+        # Pre-encoded IPC status response, republished on every mode change
+        self._status_bytes: bytes = b""
+        self._refresh_status_bytes()
+        
+        logger.info(f"Initialized miner state - {self.total_threads} CPU threads available")
+    
+    @property
+    def rev(self) -> int:
+        """Get current state revision"""
+        return self._snapshot.rev
     
     @property
     def mode(self) -> MiningMode:
         """Get current mining mode"""
-        with self._lock:
-            return self._mode
+        return self._snapshot.mode
     
     @property
     def is_mining(self) -> bool:
         """Check if currently mining"""
-        with self._lock:
-            return self._mode != MiningMode.STOPPED and self._xmrig_pid is not None
+        snap = self._snapshot
+        return snap.mode != MiningMode.STOPPED and snap.pid is not None
     
     @property
     def xmrig_pid(self) -> Optional[int]:
         """Get xmrig process ID"""
-        with self._lock:
-            return self._xmrig_pid
+        return self._snapshot.pid
     
     @property
     def threads_active(self) -> int:
         """Get active thread count"""
-        with self._lock:
-            return self._threads_active
+        return self._snapshot.threads_active
     
     @property
     def total_threads(self) -> int:
         """Get total available threads"""
-        return self._total_threads
+        return self._snapshot.total_threads
     
     @property
     def hashrate(self) -> Optional[str]:
         """Get current hashrate"""
-        with self._lock:
-            return self._hashrate
+        return self._snapshot.hashrate
     
     @property
     def uptime_seconds(self) -> Optional[int]:
         """Get mining uptime in seconds"""
-        with self._lock:
-            if self._start_time and self.is_mining:
-                return int(time.time() - self._start_time)
-            return None
+        snap = self._snapshot
+        if snap.start_time and snap.mode != MiningMode.STOPPED and snap.pid is not None:
+            return int(time.time() - snap.start_time)
+        return None
     
     @property
     def last_error(self) -> Optional[str]:
         """Get last error message"""
-        with self._lock:
-            return self._last_error
+        return self._snapshot.last_error
     
     def start_mining(self, mode: MiningMode, pid: int, threads: int) -> bool:
         """Start mining with specified mode"""
@@ -91,93 +171,195 @@ class MinerState:
             return False
             
         with self._lock:
-            self._mode = mode
-            self._xmrig_pid = pid
-            self._threads_active = threads
-            self._start_time = time.time()
-            self._last_error = None
-            self._hashrate = None
-            
-            self.add_log(f"Mining started: {mode.value} mode with {threads} threads (PID: {pid})")
-            logger.info(f"Mining started: {mode.value} mode, {threads} threads, PID {pid}")
-            return True
+            self._replace_snapshot(
+                mode=mode,
+                pid=pid,
+                threads_active=threads,
+                start_time=time.time(),
+                last_error=None,
+                hashrate=None
+            )
+            self._refresh_status_bytes()
+        
+        self.add_log(f"Mining started: {mode.value} mode with {threads} threads (PID: {pid})")
+        logger.info(f"Mining started: {mode.value} mode, {threads} threads, PID {pid}")
+        return True
     
     def stop_mining(self, reason: str = "User requested") -> bool:
         """Stop mining"""
         with self._lock:
-            if self._mode == MiningMode.STOPPED:
+            if self._snapshot.mode == MiningMode.STOPPED:
                 return False
                 
-            old_mode = self._mode.value
-            self._mode = MiningMode.STOPPED
-            self._xmrig_pid = None
-            self._threads_active = 0
-            self._start_time = None
-            self._hashrate = None
-            
-            self.add_log(f"Mining stopped: {reason}")
-            logger.info(f"Mining stopped: {old_mode} -> stopped, reason: {reason}")
-            return True
+            old_mode = self._snapshot.mode.value
+            self._replace_snapshot(
+                mode=MiningMode.STOPPED,
+                pid=None,
+                threads_active=0,
+                start_time=None,
+                hashrate=None
+            )
+            self._refresh_status_bytes()
+        
+        self.add_log(f"Mining stopped: {reason}")
+        logger.info(f"Mining stopped: {old_mode} -> stopped, reason: {reason}")
+        return True
     
     def set_error(self, error: str):
         """Set error state"""
         with self._lock:
-            self._last_error = error
-            self.add_log(f"ERROR: {error}")
-            logger.error(error)
+            self._replace_snapshot(last_error=error)
+        self.add_log(f"ERROR: {error}")
+        logger.error(error)
     
     def clear_error(self):
         """Clear error state"""
         with self._lock:
-            self._last_error = None
+            self._replace_snapshot(last_error=None)
     
     def add_log(self, message: str):
         """Add log message to buffer"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_line = f"[{timestamp}] {message}"
-        
-        with self._lock:
-            self._log_buffer.append(log_line)
+        timestamp = _log_timestamp()
+        self._append_log(f"[{timestamp}] {message}")
         
         # Also log to Python logger
         logger.info(message)
     
+    def _replace_snapshot(self, **fields):
+        """Publish a new snapshot with the next revision (caller holds the lock)"""
+        self._snapshot = self._snapshot._replace(rev=self._snapshot.rev + 1, **fields)
+        self._changed.notify_all()
+    
+    def wait_for_change(self, rev: int, timeout: float) -> int:
+        """Block until the revision moves past rev or timeout expires; return the current revision"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.rev != rev, timeout)
+            return self._snapshot.rev
+    
     def get_log_tail(self, lines: int = 20) -> List[str]:
         """Get recent log messages"""
+        self._drain_log_inbox()
+        head = self._log_head
+        ring = self._log_ring
+        count = min(lines, head, LOG_CAPACITY)
+        return [ring[i % LOG_CAPACITY] for i in range(head - count, head)]
+    
+    def _append_log(self, line: str):
+        """Queue a log line without taking the state lock"""
+        self._log_inbox.put(line)
+        if self._log_inbox.qsize() > LOG_CAPACITY:
+            self._drain_log_inbox()
+    
+    def _drain_log_inbox(self):
+        """Fold queued log lines into the ring"""
         with self._lock:
-            return list(self._log_buffer)[-lines:]
+            while True:
+                try:
+                    line = self._log_inbox.get_nowait()
+                except queue.Empty:
+                    return
+                self._log_ring[self._log_head % LOG_CAPACITY] = line
+                self._log_head += 1
     
     def update_hashrate(self, hashrate: str):
         """Update current hashrate"""
         with self._lock:
-            self._hashrate = hashrate
+            self._replace_snapshot(hashrate=hashrate)
+    
+    def apply_xmrig_line(self, line: str, hashrate: Optional[str] = None, error: Optional[str] = None):
+        """Record an xmrig output line and its parsed results"""
+        timestamp = _log_timestamp()
+        
+        self._append_log(f"[{timestamp}] {line}")
+        if hashrate or error:
+            with self._lock:
+                self._replace_snapshot(
+                    hashrate=hashrate or self._snapshot.hashrate,
+                    last_error=error or self._snapshot.last_error
+                )
+        if error:
+            self._append_log(f"[{timestamp}] ERROR: {error}")
+        
+        # Also log to Python logger
+        logger.info(line)
+        if error:
+            logger.error(error)
+    
+    def _refresh_status_bytes(self):
+        """Re-encode the IPC status response (caller holds the lock)"""
+        snap = self._snapshot
+        self._status_bytes = json_dumps({
+            "ok": True,
+            "mining_active": snap.mode != MiningMode.STOPPED and snap.pid is not None,
+            "current_mode": snap.mode.value,
+            "mining_threads": snap.threads_active,
+            "total_threads": snap.total_threads
+        })
+    
+    @property
+    def status_bytes(self) -> bytes:
+        """Get pre-encoded IPC status response (lock-free read)"""
+        return self._status_bytes
     
     def get_status_dict(self) -> Dict[str, Any]:
         """Get complete status as dictionary"""
-        with self._lock:
-            uptime = None
-            if self._start_time and self.is_mining:
-                uptime = int(time.time() - self._start_time)
-                
-            return {
-                "mode": self._mode.value,
-                "is_mining": self.is_mining,
-                "pid": self._xmrig_pid,
-                "threads_active": self._threads_active,
-                "total_threads": self._total_threads,
-                "hashrate": self._hashrate,
-                "uptime_seconds": uptime,
-                "last_error": self._last_error,
-                "log_tail": list(self._log_buffer)
+        snap = self._snapshot
+        log_tail = self.get_log_tail(LOG_CAPACITY)
+            
+        return {
+            "mode": snap.mode.value,
+            "is_mining": snap.mode != MiningMode.STOPPED and snap.pid is not None,
+            "pid": snap.pid,
+            "threads_active": snap.threads_active,
+            "total_threads": snap.total_threads,
+            "hashrate": snap.hashrate,
+            "uptime_seconds": self.uptime_seconds,
+            "last_error": snap.last_error,
+            "log_tail": log_tail
+        }
+    
+    def get_status_delta(self, since: Optional[int] = None, log_from: int = 0,
+                         log_lines: int = LOG_CAPACITY) -> Dict[str, Any]:
+        """Get status changes since revision `since` and at most `log_lines` log lines
+        from absolute index `log_from`"""
+        self._drain_log_inbox()
+        snap = self._snapshot
+        head = self._log_head
+        
+        # Out-of-range offsets (e.g. from before a daemon restart) resend the whole ring
+        if not 0 <= log_from <= head:
+            log_from = 0
+        start = max(log_from, head - min(log_lines, LOG_CAPACITY))
+        ring = self._log_ring
+        
+        changed = {}
+        if since != snap.rev:
+            changed = {
+                "mode": snap.mode.value,
+                "is_mining": snap.mode != MiningMode.STOPPED and snap.pid is not None,
+                "pid": snap.pid,
+                "threads_active": snap.threads_active,
+                "total_threads": snap.total_threads,
+                "hashrate": snap.hashrate,
+                "last_error": snap.last_error
             }
+        
+        return {
+            "ok": True,
+            "rev": snap.rev,
+            "changed": changed,
+            "uptime_seconds": self.uptime_seconds,
+            "log_head": head,
+            "log_append": [ring[i % LOG_CAPACITY] for i in range(start, head)]
+        }
     
     def calculate_threads_for_mode(self, mode: MiningMode) -> tuple[int, int]:
         """Calculate threads and priority for mining mode"""
         if mode == MiningMode.BACKGROUND:
-            threads = max(1, int(self._total_threads * 0.5))  # 50%
+            threads = max(1, int(self.total_threads * 0.5))  # 50%
             priority = 1  # Low priority
         elif mode == MiningMode.MONEY_HUNTER:
-            threads = max(1, int(self._total_threads * 0.8))  # 80%
+            threads = max(1, int(self.total_threads * 0.8))  # 80%
             priority = 3  # High priority
         else:
             threads = 0
@@ -189,23 +371,48 @@ class SystemInfo:
     """System information and monitoring"""
     
     @staticmethod
+    def start_cpu_sampler():
+        """Sample cpu_percent on a background thread, so reads never block and
+        always cover a fresh window however long ago the last poll was"""
+        global _cpu_sampler
+        if _cpu_sampler is not None:
+            return
+        psutil.cpu_percent(interval=None)  # Open the first window
+        _cpu_sampler_stop.clear()
+        _cpu_sampler = Thread(target=_sample_cpu_percent, name="cpu-sampler", daemon=True)
+        _cpu_sampler.start()
+    
+    @staticmethod
+    def stop_cpu_sampler():
+        """Stop the cpu_percent sampler thread"""
+        global _cpu_sampler
+        if _cpu_sampler is None:
+            return
+        _cpu_sampler_stop.set()
+        _cpu_sampler.join(timeout=2)
+        _cpu_sampler = None
+    
+    @staticmethod
+    @_ttl_cache(1.0)
     def get_cpu_info() -> Dict[str, Any]:
         """Get CPU information"""
         try:
             cpu_freq = psutil.cpu_freq()
             return {
-                "logical_cores": psutil.cpu_count(logical=True),
-                "physical_cores": psutil.cpu_count(logical=False),
+                "logical_cores": _TOTAL_THREADS,
+                "physical_cores": _PHYSICAL_CORES,
                 "current_freq_mhz": int(cpu_freq.current) if cpu_freq else None,
                 "max_freq_mhz": int(cpu_freq.max) if cpu_freq else None,
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                # Utilisation over the sampler's last window (non-blocking)
+                "cpu_percent": _cpu_percent,
                 "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else None
             }
         except Exception as e:
             logger.error(f"Failed to get CPU info: {e}")
-            return {"logical_cores": psutil.cpu_count(logical=True)}
+            return {"logical_cores": _TOTAL_THREADS}
     
     @staticmethod
+    @_ttl_cache(1.0)
     def get_memory_info() -> Dict[str, Any]:
         """Get memory information"""
         try:
@@ -220,6 +427,7 @@ class SystemInfo:
             return {}
     
     @staticmethod
+    @_ttl_cache(1.0)
     def get_thermal_info() -> Dict[str, Any]:
         """Get thermal information if available"""
         try:
@@ -239,7 +447,8 @@ class SystemInfo:
                 thermal_info = {}
                 for name, entries in temps.items():
                     if entries:
-                        avg_temp = sum(entry.current for entry in entries) / len(entries)
+                        temps_c = list(map(_sensor_current, entries))
+                        avg_temp = math.fsum(temps_c) / len(temps_c)
                         thermal_info[name] = {
                             "current_c": round(avg_temp, 1),
                             "sensors": len(entries)
@@ -253,6 +462,16 @@ class SystemInfo:
             logger.debug(f"Thermal sensors not available: {e}")
             return {}
     
+    @staticmethod
+    @_ttl_cache(1.0)
+    def get_system_info() -> Dict[str, Any]:
+        """Get CPU, memory and thermal information as one cached snapshot"""
+        return {
+            "cpu_info": SystemInfo.get_cpu_info(),
+            "memory_info": SystemInfo.get_memory_info(),
+            "thermal_info": SystemInfo.get_thermal_info()
+        }
+    
     @staticmethod
     def is_process_running(pid: int) -> bool:
         """Check if process is running"""
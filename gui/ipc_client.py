@@ -4,200 +4,445 @@ Communication with daemon via Unix socket
 Onyx Digital Intelligence Development
 """
 
+import os
 import json
-import socket
 import logging
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Mapping
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer
+from PyQt6.QtNetwork import QLocalSocket
+
+try:
+    import orjson
+except ImportError:  # Optional C accelerator - fall back to stdlib json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _encode_frame(request: Dict[str, Any]) -> bytes:
+    """Encode a request as a length-prefixed frame"""
+    payload = _json_dumps(request)
+    return len(payload).to_bytes(FRAME_HEADER_SIZE, "big") + payload
+
+def _json_loads(data: memoryview):
+    """Parse JSON from a bytes-like view (orjson reads it without copying)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+# Frames are a 4-byte big-endian length followed by a JSON payload
+FRAME_HEADER_SIZE = 4
+
+# Status polling cadence: visible, minimized, and the cap for error backoff
+POLL_INTERVAL_MS = 2000
+POLL_INTERVAL_MINIMIZED_MS = 10000
+POLL_INTERVAL_MAX_MS = 16000
+
+# Most log lines requested per status update - all the log panel shows
+STATUS_LOG_LINES = 20
+
+# Mining modes accepted by the daemon's start command
+_VALID_MODES = frozenset(("background", "money_hunter"))
+
+ResponseCallback = Callable[[Optional[Dict[str, Any]]], None]
+
 class IPCClient(QObject):
-    """IPC client for daemon communication"""
+    """IPC client for daemon communication
+    
+    Requests are pipelined on one QLocalSocket driven by the Qt event loop.
+    The daemon answers each connection's frames in order, so responses are
+    matched to requests first-in, first-out.
+    
+    The client is meant to live on its own QThread: invoke the command slots
+    with queued connections and receive results through the signals.
+    """
     
     # Signals for GUI updates
     status_updated = pyqtSignal(dict)
     connection_changed = pyqtSignal(bool)
     error_occurred = pyqtSignal(str)
     
+    # Command results
+    mining_started = pyqtSignal(str)
+    mining_stopped = pyqtSignal()
+    config_received = pyqtSignal(dict)
+    config_saved = pyqtSignal()
+    system_info_updated = pyqtSignal(dict)
+    
     def __init__(self):
         super().__init__()
         self.socket_path = Path.home() / ".onyx_monero" / "daemon.sock"
-        self.connected = False
+        # None until the first request succeeds or fails, so a daemon that
+        # is down at startup is reported through connection_changed too
+        self.connected: Optional[bool] = None
+        
+        # Persistent daemon connection, opened lazily on first request; the
+        # server name is resolved once and reused for every reconnect
+        self._sock = QLocalSocket(self)
+        self._sock.setServerName(os.fspath(self.socket_path))
+        self._sock.connected.connect(self._on_connected)
+        self._sock.disconnected.connect(self._on_disconnected)
+        self._sock.readyRead.connect(self._on_ready_read)
+        self._sock.errorOccurred.connect(self._on_socket_error)
+        
+        # Second connection subscribed to daemon state_change events, opened
+        # alongside the request connection; each event triggers refresh_all
+        self._event_sock = QLocalSocket(self)
+        self._event_sock.setServerName(os.fspath(self.socket_path))
+        self._event_sock.connected.connect(self._on_event_connected)
+        self._event_sock.readyRead.connect(self._on_event_ready_read)
+        self._event_rx = bytearray()
+        
+        # Received bytes not yet parsed, frames queued until connected,
+        # and (callback, timeout timer) per request awaiting a response
+        self._rx = bytearray()
+        self._tx: list[bytes] = []
+        self._pending: deque[tuple[Optional[ResponseCallback], QTimer]] = deque()
         
-        # Status polling timer (start disabled)
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.request_status)
-        # Don't start automatically - will be started after initial connection
+        # Status revision and absolute log index already delivered, so the
+        # daemon only sends changed fields and new log lines
+        self._status_rev: Optional[int] = None
+        self._log_from = 0
+        
+        # Status polling timer, started once the daemon first answers; the
+        # interval doubles per consecutive failed refresh, up to
+        # POLL_INTERVAL_MAX_MS, so polls double as paced reconnect attempts
+        self._poll_base_ms = POLL_INTERVAL_MS
+        self._poll_failures = 0
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(POLL_INTERVAL_MS)
+        self.status_timer.timeout.connect(self.refresh_all)
         
         logger.info("IPC client initialized")
+    
+    def _send_request(self, request: Dict[str, Any], callback: Optional[ResponseCallback] = None,
+                      timeout: float = 10.0):
+        """Queue request to daemon; callback gets the response, or None on failure"""
+        frame = _encode_frame(request)
+        
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda cmd=request.get('cmd', 'unknown'): self._on_request_timeout(cmd))
+        timer.start(int(timeout * 1000))
+        self._pending.append((callback, timer))
+        
+        state = self._sock.state()
+        if state == QLocalSocket.LocalSocketState.ConnectedState:
+            self._sock.write(frame)
+        else:
+            self._tx.append(frame)
+            if state == QLocalSocket.LocalSocketState.UnconnectedState:
+                self._sock.connectToServer()
+    
+    @pyqtSlot()
+    def _on_connected(self):
+        """Flush requests queued while connecting"""
+        for frame in self._tx:
+            self._sock.write(frame)
+        self._tx.clear()
         
-        # Test connection with simple ping
-        self.test_connection()
+        # (Re)subscribe to state change events
+        if self._event_sock.state() == QLocalSocket.LocalSocketState.UnconnectedState:
+            self._event_rx.clear()
+            self._event_sock.connectToServer()
     
-    def _send_request(self, request: Dict[str, Any], timeout: float = 10.0) -> Optional[Dict[str, Any]]:
-        """Send request to daemon and return response"""
-        try:
-            # Create socket
-            client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            client_socket.settimeout(timeout)
-            
-            try:
-                # Connect to daemon
-                client_socket.connect(str(self.socket_path))
-                
-                # Send request
-                request_data = json.dumps(request).encode('utf-8')
-                client_socket.sendall(request_data)
-                
-                # Receive response
-                response_data = client_socket.recv(8192)  # Increased buffer for status data
-                response = json.loads(response_data.decode('utf-8'))
-                
-                # Update connection status
-                if not self.connected:
-                    self.connected = True
-                    self.connection_changed.emit(True)
-                    logger.info("Connected to daemon")
-                    # Status polling disabled - causes daemon to hang
-                    # if not self.status_timer.isActive():
-                    #     self.status_timer.start(5000)  # Poll every 5 seconds
-                
-                return response
-                
-            finally:
-                client_socket.close()
-                
-        except (ConnectionRefusedError, FileNotFoundError):
-            if self.connected:
-                self.connected = False
-                self.connection_changed.emit(False)
-                logger.warning("Lost connection to daemon")
-            return None
-            
-        except socket.timeout:
-            logger.error(f"Request timeout: {request.get('cmd', 'unknown')}")
-            self.error_occurred.emit("Request timeout - daemon may be busy")
-            return None
+    @pyqtSlot()
+    def _on_event_connected(self):
+        """Start the event stream"""
+        self._event_sock.write(_encode_frame({"cmd": "subscribe"}))
+    
+    @pyqtSlot()
+    def _on_event_ready_read(self):
+        """Refresh once per batch of state change events"""
+        events = self._read_frames(self._event_sock, self._event_rx)
+        if any(event and event.get("evt") == "state_change" for event in events):
+            self.refresh_all()
+    
+    def _read_frames(self, sock: QLocalSocket, rx: bytearray) -> list:
+        """Append readable bytes to rx and parse every complete frame (None if invalid)"""
+        rx += sock.readAll().data()
+        
+        # Parse payloads in place, then drop the consumed prefix in one step
+        frames = []
+        offset = 0
+        with memoryview(rx) as view:
+            while len(rx) - offset >= FRAME_HEADER_SIZE:
+                start = offset + FRAME_HEADER_SIZE
+                end = start + int.from_bytes(view[offset:start], "big")
+                if len(rx) < end:
+                    break
+                try:
+                    frames.append(_json_loads(view[start:end]))
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    logger.error(f"Invalid JSON response: {e}")
+                    self.error_occurred.emit("Invalid response from daemon")
+                    frames.append(None)
+                offset = end
+        del rx[:offset]
+        return frames
+    
+    @pyqtSlot()
+    def _on_ready_read(self):
+        """Parse every complete response frame received so far"""
+        responses = self._read_frames(self._sock, self._rx)
+        
+        # Callbacks run after the buffer is released - they may reset the connection
+        for response in responses:
+            if not self._pending:
+                logger.warning("Dropping unexpected response from daemon")
+                continue
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response: {e}")
-            self.error_occurred.emit("Invalid response from daemon")
-            return None
+            callback, timer = self._pending.popleft()
+            timer.stop()
+            timer.deleteLater()
             
-        except Exception as e:
-            logger.error(f"IPC error: {e}")
-            self.error_occurred.emit(f"Communication error: {e}")
-            return None
+            if response is not None:
+                self._set_connected(True)
+            if callback:
+                callback(response)
+    
+    def _on_request_timeout(self, cmd: str):
+        """Handle a request that got no response in time"""
+        logger.error(f"Request timeout: {cmd}")
+        self.error_occurred.emit("Request timeout - daemon may be busy")
+        # A late reply would be matched to the wrong request - start over
+        self._reset_connection()
     
+    @pyqtSlot()
+    def _on_disconnected(self):
+        """Daemon closed the connection"""
+        # Idle connections are closed by the daemon; only in-flight requests are lost
+        if self._pending:
+            self._reset_connection()
+    
+    @pyqtSlot(QLocalSocket.LocalSocketError)
+    def _on_socket_error(self, error: QLocalSocket.LocalSocketError):
+        """Handle connect and I/O failures"""
+        if error == QLocalSocket.LocalSocketError.PeerClosedError:
+            return  # Reported through disconnected
+        if error not in (QLocalSocket.LocalSocketError.ServerNotFoundError,
+                         QLocalSocket.LocalSocketError.ConnectionRefusedError):
+            logger.error(f"IPC error: {self._sock.errorString()}")
+            self.error_occurred.emit(f"Communication error: {self._sock.errorString()}")
+        self._reset_connection()
+    
+    def _reset_connection(self):
+        """Drop the connection and fail every outstanding request"""
+        pending = list(self._pending)
+        self._pending.clear()
+        self._tx.clear()
+        self._rx.clear()
+        self._sock.abort()
+        
+        self._set_connected(False)
+        for callback, timer in pending:
+            timer.stop()
+            timer.deleteLater()
+            if callback:
+                callback(None)
+    
+    def _set_connected(self, connected: bool):
+        """Update connection status"""
+        if connected == self.connected:
+            return
+        self.connected = connected
+        self.connection_changed.emit(connected)
+        if connected:
+            logger.info("Connected to daemon")
+            self.start_polling()
+        else:
+            logger.warning("Lost connection to daemon")
+    
+    @pyqtSlot()
     def test_connection(self):
         """Test daemon connection with simple ping"""
-        response = self._send_request({"cmd": "ping"}, timeout=3.0)
-        if response and response.get("ok"):
-            logger.info("Daemon connection test successful")
-        else:
-            logger.warning("Daemon connection test failed")
+        def on_response(response):
+            if response and response.get("ok"):
+                logger.info("Daemon connection test successful")
+            else:
+                logger.warning("Daemon connection test failed")
+        self._send_request({"cmd": "ping"}, on_response, timeout=3.0)
     
-    def request_status(self):
-        """Request status from daemon"""
-        response = self._send_request({"cmd": "status"})
+    def _status_request(self) -> Dict[str, Any]:
+        """Build a delta status request from what has already been delivered"""
+        return {
+            "cmd": "status",
+            "since": self._status_rev,
+            "log_from": self._log_from,
+            "log_lines": STATUS_LOG_LINES
+        }
+    
+    def _on_status_response(self, response: Optional[Dict[str, Any]]):
+        """Publish a status delta: changed fields, uptime and new log lines"""
         if response and response.get("ok"):
+            rev = response.get("rev")
+            head = response.get("log_head", 0)
+            if head >= self._log_from:
+                # Requests in flight together share log_from; drop the lines
+                # an earlier reply already delivered
+                lines = response.get("log_append") or []
+                seen = self._log_from - (head - len(lines))
+                if seen > 0:
+                    response["log_append"] = lines[seen:]
+                if self._status_rev is not None and rev is not None and rev < self._status_rev:
+                    response["changed"] = {}
+                    rev = self._status_rev
+            # Otherwise the daemon restarted and its log index started over
+            self._status_rev = rev
+            self._log_from = head
             self.status_updated.emit(response)
         elif response:
             error_msg = response.get("error", "Unknown error")
             self.error_occurred.emit(f"Status error: {error_msg}")
     
-    def start_mining(self, mode: str) -> bool:
-        """Start mining with specified mode"""
-        if mode not in ["background", "money_hunter"]:
-            self.error_occurred.emit(f"Invalid mining mode: {mode}")
-            return False
-        
-        response = self._send_request({"cmd": "start", "mode": mode}, timeout=60.0)
+    def _check_response(self, response: Optional[Dict[str, Any]], failure: str) -> bool:
+        """Return True for a successful response, otherwise report why it failed"""
         if response and response.get("ok"):
-            logger.info(f"Started {mode} mining")
-            # Immediately request status update
-            self.request_status()
             return True
-        elif response:
-            error_msg = response.get("error", "Unknown error")
-            self.error_occurred.emit(f"Failed to start mining: {error_msg}")
-            return False
+        if response:
+            self.error_occurred.emit(failure + ": " + response.get("error", "Unknown error"))
         else:
             self.error_occurred.emit("Cannot communicate with daemon")
-            return False
+        return False
     
-    def stop_mining(self) -> bool:
-        """Stop mining"""
-        response = self._send_request({"cmd": "stop"}, timeout=30.0)
-        if response and response.get("ok"):
-            logger.info("Mining stopped")
-            # Immediately request status update
-            self.request_status()
-            return True
-        elif response:
-            error_msg = response.get("error", "Unknown error")
-            self.error_occurred.emit(f"Failed to stop mining: {error_msg}")
-            return False
-        else:
-            self.error_occurred.emit("Cannot communicate with daemon")
-            return False
+    def _on_config_response(self, response: Optional[Dict[str, Any]]):
+        """Publish a config_get response"""
+        if self._check_response(response, "Failed to get config"):
+            self.config_received.emit(response.get("config", {}))
     
-    def get_config(self) -> Optional[Dict[str, Any]]:
-        """Get current configuration"""
-        response = self._send_request({"cmd": "config_get"})
+    def _on_system_info_response(self, response: Optional[Dict[str, Any]]):
+        """Publish a system_info response (cpu_info, memory_info, thermal_info)"""
         if response and response.get("ok"):
-            return response.get("config", {})
-        elif response:
-            error_msg = response.get("error", "Unknown error")
-            self.error_occurred.emit(f"Failed to get config: {error_msg}")
-            return None
-        else:
-            self.error_occurred.emit("Cannot communicate with daemon")
-            return None
+            self.system_info_updated.emit(response)
     
-    def set_config(self, config: Dict[str, Any]) -> bool:
-        """Set configuration"""
-        request = {"cmd": "config_set", **config}
-        response = self._send_request(request)
-        if response and response.get("ok"):
-            logger.info("Configuration updated")
-            return True
-        elif response:
-            error_msg = response.get("error", "Unknown error")
-            self.error_occurred.emit(f"Failed to save config: {error_msg}")
-            return False
-        else:
-            self.error_occurred.emit("Cannot communicate with daemon")
-            return False
+    @pyqtSlot()
+    def request_status(self):
+        """Request status from daemon"""
+        self._send_request(self._status_request(), self._on_status_response)
     
-    def get_system_info(self) -> Optional[Dict[str, Any]]:
-        """Get system information"""
-        response = self._send_request({"cmd": "system_info"})
-        if response and response.get("ok"):
-            return {
-                "cpu_info": response.get("cpu_info", {}),
-                "memory_info": response.get("memory_info", {}),
-                "thermal_info": response.get("thermal_info", {})
-            }
-        return None
-    
-    def ping_daemon(self) -> bool:
-        """Ping daemon to check connectivity"""
-        response = self._send_request({"cmd": "ping"}, timeout=3.0)
-        return response and response.get("ok", False)
+    @pyqtSlot()
+    def refresh_all(self):
+        """Request status and config in one round trip"""
+        handlers = {
+            "status": self._on_status_response,
+            "config_get": self._on_config_response,
+        }
+        cmds = [self._status_request(), "config_get"]
+        
+        def on_response(response):
+            self._record_poll_result(bool(response and response.get("ok")))
+            if response is None:
+                # Reported once, as the connection_changed(False) transition
+                return
+            if not response.get("ok"):
+                error_msg = response.get("error", "Unknown error")
+                self.error_occurred.emit(f"Refresh failed: {error_msg}")
+            else:
+                results = response.get("results", {})
+                for cmd, handler in handlers.items():
+                    if cmd in results:
+                        handler(results[cmd])
+        self._send_request({"cmd": "bundle", "cmds": cmds}, on_response)
+    
+    @pyqtSlot(str)
+    def start_mining(self, mode: str):
+        """Start mining with specified mode; emits mining_started on success"""
+        if mode not in _VALID_MODES:
+            self.error_occurred.emit("Invalid mining mode: " + mode)
+            return
+        
+        def on_response(response):
+            if self._check_response(response, "Failed to start mining"):
+                logger.info(f"Started {mode} mining")
+                self.mining_started.emit(mode)
+                # Immediately request status update
+                self.request_status()
+        self._send_request({"cmd": "start", "mode": mode}, on_response, timeout=60.0)
+    
+    @pyqtSlot()
+    def stop_mining(self):
+        """Stop mining; emits mining_stopped on success"""
+        def on_response(response):
+            if self._check_response(response, "Failed to stop mining"):
+                logger.info("Mining stopped")
+                self.mining_stopped.emit()
+                # Immediately request status update
+                self.request_status()
+        self._send_request({"cmd": "stop"}, on_response, timeout=30.0)
+    
+    @pyqtSlot()
+    def request_config(self):
+        """Request current configuration; emits config_received"""
+        self._send_request({"cmd": "config_get"}, self._on_config_response)
+    
+    @pyqtSlot(dict)
+    def set_config(self, config: Dict[str, Any]):
+        """Set configuration; emits config_saved on success"""
+        def on_response(response):
+            if self._check_response(response, "Failed to save config"):
+                logger.info("Configuration updated")
+                self.config_saved.emit()
+        self._send_request({"cmd": "config_set", **config}, on_response)
+    
+    @pyqtSlot()
+    def request_system_info(self):
+        """Request system information; emits system_info_updated"""
+        self._send_request({"cmd": "system_info"}, self._on_system_info_response)
+    
+    @pyqtSlot()
+    def ping_daemon(self):
+        """Ping daemon to check connectivity; result arrives via connection_changed"""
+        self._send_request({"cmd": "ping"}, timeout=3.0)
     
     def is_connected(self) -> bool:
         """Check if connected to daemon"""
-        return self.connected
+        return bool(self.connected)
     
+    @pyqtSlot()
+    def close(self):
+        """Close the daemon connection, dropping outstanding requests"""
+        for _, timer in self._pending:
+            timer.stop()
+        self._pending.clear()
+        self._tx.clear()
+        self._sock.abort()
+        self._event_sock.abort()
+    
+    @pyqtSlot()
     def start_polling(self):
         """Start status polling"""
         if not self.status_timer.isActive():
-            self.status_timer.start(2000)
+            self.status_timer.start()
             logger.info("Started status polling")
     
+    @pyqtSlot(int)
+    def set_poll_interval(self, interval_ms: int):
+        """Set the healthy polling interval (e.g. slower while minimized)"""
+        self._poll_base_ms = interval_ms
+        self._apply_poll_interval()
+    
+    def _record_poll_result(self, ok: bool):
+        """Back off polling while refreshes fail, reset on success"""
+        failures = 0 if ok else min(self._poll_failures + 1, 8)
+        if failures != self._poll_failures:
+            self._poll_failures = failures
+            self._apply_poll_interval()
+    
+    def _apply_poll_interval(self):
+        """Update the timer from the base interval and failure backoff"""
+        interval = min(self._poll_base_ms << self._poll_failures, POLL_INTERVAL_MAX_MS)
+        if interval != self.status_timer.interval():
+            self.status_timer.setInterval(interval)
+    
+    @pyqtSlot()
     def stop_polling(self):
         """Stop status polling"""
         if self.status_timer.isActive():
@@ -210,6 +455,7 @@ class ConnectionStatus:
     def __init__(self, ipc_client: IPCClient):
         self.ipc_client = ipc_client
         self.last_status = {}
+        self._last_status_view = MappingProxyType(self.last_status)
         self.error_count = 0
         
         # Connect to signals
@@ -237,6 +483,7 @@ class ConnectionStatus:
     def on_status_updated(self, status: dict):
         """Handle status update"""
         self.last_status = status
+        self._last_status_view = MappingProxyType(status)
         self.error_count = 0  # Reset error count on successful status
     
     def get_connection_message(self) -> str:
@@ -246,9 +493,9 @@ class ConnectionStatus:
         else:
             return "Daemon not running. Start with: systemctl start onyx-monero-daemon"
     
-    def get_last_status(self) -> dict:
-        """Get last known status"""
-        return self.last_status.copy()
+    def get_last_status(self) -> Mapping[str, Any]:
+        """Get last known status as a read-only view"""
+        return self._last_status_view
     
     def is_healthy(self) -> bool:
         """Check if connection is healthy"""
@@ -4,26 +4,31 @@ Professional mining control interface with Arctic Terminal theme
 Onyx Digital Intelligence Development
 """
 
-import sys
 import logging
-from pathlib import Path
-from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
-                            QPushButton, QLabel, QGroupBox, QTextEdit, QFrame,
-                            QMessageBox, QProgressBar, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, pyqtSlot
-from PyQt6.QtGui import QFont, QIcon
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
+                            QPushButton, QLabel, QGroupBox, QTextEdit, QSizePolicy)
+from PyQt6.QtCore import Qt, QTimer, QThread, QEvent, QMetaObject, Q_ARG, pyqtSlot
 
 from .theme import OnyxTheme, FontManager
-from .ipc_client import IPCClient, ConnectionStatus
+from .ipc_client import IPCClient, ConnectionStatus, POLL_INTERVAL_MS, POLL_INTERVAL_MINIMIZED_MS
 
 logger = logging.getLogger(__name__)
 
+# Lines kept in the log panel
+LOG_MAX_LINES = 200
+
+def _set_style_property(widget: QWidget, name: str, value: str):
+    """Change a stylesheet selector property and re-polish the widget"""
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
 class StatusPanel(QGroupBox):
     """Mining status display panel"""
     
     def __init__(self):
         super().__init__("Mining Status")
-        self.setStyleSheet(OnyxTheme.get_panel_style())
         self.init_ui()
     
     def init_ui(self):
@@ -37,11 +42,15 @@ class StatusPanel(QGroupBox):
         
         self.mode_label = QLabel("Mode: Stopped")
         self.mode_label.setFont(FontManager.get_primary_font(14, 600))
-        self.mode_label.setStyleSheet(OnyxTheme.get_status_label_style())
+        self.mode_label.setProperty("status", "normal")
         
         self.connection_label = QLabel("Daemon: Disconnected")
         self.connection_label.setFont(FontManager.get_primary_font(12))
-        self.connection_label.setStyleSheet(OnyxTheme.get_status_label_style("error"))
+        self.connection_label.setProperty("status", "error")
+        
+        # Current label styles, so labels are only re-polished on change
+        self._mode_style = "normal"
+        self._connection_style = "error"
         
         status_row.addWidget(self.mode_label, 2)
         status_row.addWidget(self.connection_label, 1)
@@ -54,11 +63,11 @@ class StatusPanel(QGroupBox):
         left_col = QVBoxLayout()
         self.threads_label = QLabel("Threads: 0 / 0")
         self.threads_label.setFont(FontManager.get_primary_font(12))
-        self.threads_label.setStyleSheet(f"color: {OnyxTheme.TEXT_SECONDARY};")
+        self.threads_label.setProperty("role", "secondary")
         
         self.hashrate_label = QLabel("Hashrate: N/A")
         self.hashrate_label.setFont(FontManager.get_primary_font(12))
-        self.hashrate_label.setStyleSheet(f"color: {OnyxTheme.TEXT_SECONDARY};")
+        self.hashrate_label.setProperty("role", "secondary")
         
         left_col.addWidget(self.threads_label)
         left_col.addWidget(self.hashrate_label)
@@ -67,11 +76,11 @@ class StatusPanel(QGroupBox):
         right_col = QVBoxLayout()
         self.uptime_label = QLabel("Uptime: N/A")
         self.uptime_label.setFont(FontManager.get_primary_font(12))
-        self.uptime_label.setStyleSheet(f"color: {OnyxTheme.TEXT_SECONDARY};")
+        self.uptime_label.setProperty("role", "secondary")
         
         self.pool_label = QLabel("Pool: Not configured")
         self.pool_label.setFont(FontManager.get_primary_font(12))
-        self.pool_label.setStyleSheet(f"color: {OnyxTheme.TEXT_SECONDARY};")
+        self.pool_label.setProperty("role", "secondary")
         
         right_col.addWidget(self.uptime_label)
         right_col.addWidget(self.pool_label)
@@ -87,10 +96,10 @@ class StatusPanel(QGroupBox):
         is_mining = status.get("is_mining", False)
         
         self.mode_label.setText(f"Mode: {mode}")
-        if is_mining:
-            self.mode_label.setStyleSheet(OnyxTheme.get_status_label_style("active"))
-        else:
-            self.mode_label.setStyleSheet(OnyxTheme.get_status_label_style())
+        mode_style = "active" if is_mining else "normal"
+        if mode_style != self._mode_style:
+            self._mode_style = mode_style
+            _set_style_property(self.mode_label, "status", mode_style)
         
         # Threading info
         threads_active = status.get("threads_active", 0)
@@ -120,9 +129,13 @@ class StatusPanel(QGroupBox):
     
     def update_connection_status(self, connected: bool, config: dict = None):
         """Update connection status"""
+        connection_style = "active" if connected else "error"
+        if connection_style != self._connection_style:
+            self._connection_style = connection_style
+            _set_style_property(self.connection_label, "status", connection_style)
+        
         if connected:
             self.connection_label.setText("Daemon: Connected")
-            self.connection_label.setStyleSheet(OnyxTheme.get_status_label_style("active"))
             
             # Update pool info if config available
             if config:
@@ -130,7 +143,6 @@ class StatusPanel(QGroupBox):
                 self.pool_label.setText(f"Pool: {pool}")
         else:
             self.connection_label.setText("Daemon: Disconnected")
-            self.connection_label.setStyleSheet(OnyxTheme.get_status_label_style("error"))
             self.pool_label.setText("Pool: Not configured")
 
 class ControlPanel(QGroupBox):
@@ -138,11 +150,11 @@ class ControlPanel(QGroupBox):
     
     def __init__(self):
         super().__init__("Mining Controls")
-        self.setStyleSheet(OnyxTheme.get_panel_style())
         
         # State tracking
         self.current_mode = "stopped"
         self.daemon_connected = False
+        self._button_states = None  # Last applied (background, money_hunter, stop)
         
         self.init_ui()
     
@@ -154,21 +166,21 @@ class ControlPanel(QGroupBox):
         
         # Background mining button
         self.background_button = QPushButton("Background Mining")
-        self.background_button.setStyleSheet(OnyxTheme.get_button_style("success"))
+        self.background_button.setProperty("variant", "success")
         self.background_button.setFont(FontManager.get_primary_font(13, 600))
         self.background_button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.background_button.setMinimumHeight(48)
         
         # Money hunter button
         self.money_hunter_button = QPushButton("Money Hunter")
-        self.money_hunter_button.setStyleSheet(OnyxTheme.get_button_style("primary"))
+        self.money_hunter_button.setProperty("variant", "primary")
         self.money_hunter_button.setFont(FontManager.get_primary_font(13, 600))
         self.money_hunter_button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.money_hunter_button.setMinimumHeight(52)
         
         # Stop button
         self.stop_button = QPushButton("Stop Mining")
-        self.stop_button.setStyleSheet(OnyxTheme.get_button_style("danger"))
+        self.stop_button.setProperty("variant", "danger")
         self.stop_button.setFont(FontManager.get_primary_font(13, 600))
         self.stop_button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.stop_button.setMinimumHeight(48)
@@ -182,38 +194,43 @@ class ControlPanel(QGroupBox):
     def update_status(self, status: dict):
         """Update control panel based on status"""
         mode = status.get("mode", "stopped")
+        if mode == self.current_mode:
+            return
         self.current_mode = mode
         self.update_button_states()
     
     def update_connection_status(self, connected: bool):
         """Update connection status"""
+        if connected == self.daemon_connected:
+            return
         self.daemon_connected = connected
         self.update_button_states()
     
     def update_button_states(self):
         """Update button enabled/disabled states"""
-        # Disable all if not connected
         if not self.daemon_connected:
-            self.background_button.setEnabled(False)
-            self.money_hunter_button.setEnabled(False)
-            self.stop_button.setEnabled(False)
-            return
-        
-        # Enable based on current mode
-        is_stopped = self.current_mode == "stopped"
-        is_background = self.current_mode == "background"
-        is_money_hunter = self.current_mode == "money_hunter"
-        
-        self.background_button.setEnabled(not is_background)
-        self.money_hunter_button.setEnabled(not is_money_hunter)
-        self.stop_button.setEnabled(not is_stopped)
+            # Disable all if not connected
+            states = (False, False, False)
+        else:
+            # Enable based on current mode
+            states = (
+                self.current_mode != "background",
+                self.current_mode != "money_hunter",
+                self.current_mode != "stopped"
+            )
+        
+        previous = self._button_states or (None, None, None)
+        buttons = (self.background_button, self.money_hunter_button, self.stop_button)
+        for button, enabled, was_enabled in zip(buttons, states, previous):
+            if enabled != was_enabled:
+                button.setEnabled(enabled)
+        self._button_states = states
 
 class LogPanel(QGroupBox):
     """Mining log display panel"""
     
     def __init__(self):
         super().__init__("Status Log")
-        self.setStyleSheet(OnyxTheme.get_panel_style())
         self.init_ui()
     
     def init_ui(self):
@@ -222,33 +239,35 @@ class LogPanel(QGroupBox):
         layout.setContentsMargins(16, 20, 16, 16)
         
         self.log_text = QTextEdit()
-        self.log_text.setStyleSheet(OnyxTheme.get_log_panel_style())
         self.log_text.setFont(FontManager.get_monospace_font(10))
         self.log_text.setReadOnly(True)
         self.log_text.setMaximumHeight(180)
         self.log_text.setMinimumHeight(150)
         
+        # Lines are only ever appended - drop the oldest past this many
+        self.log_text.document().setMaximumBlockCount(LOG_MAX_LINES)
+        self.log_text.setUndoRedoEnabled(False)
+        
         layout.addWidget(self.log_text)
         
         # Add initial message
         self.add_log_message("Onyx Monero Mining Dashboard - Ready")
     
-    def update_log(self, log_lines: list):
-        """Update log display with new lines"""
+    def append_log(self, log_lines: list):
+        """Append new daemon log lines"""
         if not log_lines:
             return
         
-        # Get last few lines to avoid overwhelming the display
-        recent_lines = log_lines[-20:]
-        
-        # Clear and set new content
-        self.log_text.clear()
-        for line in recent_lines:
-            self.log_text.append(line)
-        
-        # Auto-scroll to bottom
+        # Inserted as one edit so the document is laid out once per batch;
+        # the daemon already limits how many lines are sent
+        text = "\n".join(log_lines)
         cursor = self.log_text.textCursor()
         cursor.movePosition(cursor.MoveOperation.End)
+        if not self.log_text.document().isEmpty():
+            text = "\n" + text
+        cursor.insertText(text)
+        
+        # Auto-scroll to bottom
         self.log_text.setTextCursor(cursor)
     
     def add_log_message(self, message: str):
@@ -269,24 +288,38 @@ class OnyxMinerMainWindow(QMainWindow):
         self.setFixedSize(700, 650)
         
         # Apply theme
-        self.setStyleSheet(OnyxTheme.get_main_window_style())
+        # One sheet for the whole window; widgets select rules by property.
+        # Skipped when the application already carries it (OnyxTheme.apply_to_app)
+        app = QApplication.instance()
+        if app is None or app.styleSheet() != OnyxTheme.get_application_style():
+            self.setStyleSheet(OnyxTheme.get_application_style())
         
-        # Initialize IPC client
+        # Initialize IPC client on its own thread; commands are queued to it
         self.ipc_client = IPCClient()
+        self._io_thread = QThread(self)
+        self.ipc_client.moveToThread(self._io_thread)
+        self._io_thread.started.connect(self.ipc_client.test_connection)
         self.connection_status = ConnectionStatus(self.ipc_client)
         
         # Connect signals
         self.ipc_client.status_updated.connect(self.on_status_updated)
         self.ipc_client.connection_changed.connect(self.on_connection_changed)
         self.ipc_client.error_occurred.connect(self.on_error)
+        self.ipc_client.config_received.connect(self.on_config_received)
+        self.ipc_client.mining_started.connect(self.on_mining_started)
+        self.ipc_client.mining_stopped.connect(self.on_mining_stopped)
         
         # Current config cache
         self.current_config = {}
         
+        # Full status assembled from the daemon's deltas
+        self._status_cache = {}
+        
         self.init_ui()
+        self._io_thread.start()
         
-        # Load initial config
-        QTimer.singleShot(1000, self.load_config)
+        # Load initial status and config in one request
+        QTimer.singleShot(1000, self.refresh_all)
     
     def init_ui(self):
         """Initialize main UI"""
@@ -300,14 +333,7 @@ class OnyxMinerMainWindow(QMainWindow):
         # Header
         header_label = QLabel("Onyx Monero Mining Dashboard")
         header_label.setFont(FontManager.get_title_font(18))
-        header_label.setStyleSheet(f"""
-            QLabel {{
-                color: {OnyxTheme.PRIMARY_ACCENT};
-                padding: 8px 0;
-                border-bottom: 2px solid {OnyxTheme.BORDER_SUBTLE};
-                margin-bottom: 8px;
-            }}
-        """)
+        header_label.setProperty("role", "header")
         header_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(header_label)
         
@@ -328,28 +354,48 @@ class OnyxMinerMainWindow(QMainWindow):
         self.log_panel = LogPanel()
         layout.addWidget(self.log_panel)
     
+    def _invoke_ipc(self, method: str, *args):
+        """Run an IPCClient slot on the IPC thread"""
+        QMetaObject.invokeMethod(self.ipc_client, method, Qt.ConnectionType.QueuedConnection, *args)
+    
     def load_config(self):
-        """Load configuration from daemon"""
-        config = self.ipc_client.get_config()
+        """Request configuration from daemon"""
+        self._invoke_ipc("request_config")
+    
+    def refresh_all(self):
+        """Request status and configuration from daemon"""
+        self._invoke_ipc("refresh_all")
+    
+    @pyqtSlot(dict)
+    def on_config_received(self, config: dict):
+        """Handle configuration loaded from daemon"""
         if config:
             self.current_config = config
             self.status_panel.update_connection_status(True, config)
     
     @pyqtSlot(dict)
     def on_status_updated(self, status: dict):
-        """Handle status update from daemon"""
-        self.status_panel.update_status(status)
-        self.control_panel.update_status(status)
+        """Handle status delta from daemon"""
+        changed = status.get("changed") or {}
+        uptime_seconds = status.get("uptime_seconds")
         
-        # Update log
-        log_lines = status.get("log_tail", [])
-        if log_lines:
-            self.log_panel.update_log(log_lines)
+        if changed or uptime_seconds != self._status_cache.get("uptime_seconds"):
+            self._status_cache.update(changed)
+            self._status_cache["uptime_seconds"] = uptime_seconds
+            self.status_panel.update_status(self._status_cache)
+        
+        if changed:
+            self.control_panel.update_status(self._status_cache)
+            
+            # Report errors once, when they change
+            error = changed.get("last_error")
+            if error:
+                self.log_panel.add_log_message(f"ERROR: {error}")
         
-        # Check for errors
-        error = status.get("last_error")
-        if error:
-            self.log_panel.add_log_message(f"ERROR: {error}")
+        # Append only lines not shown yet
+        log_lines = status.get("log_append")
+        if log_lines:
+            self.log_panel.append_log(log_lines)
     
     @pyqtSlot(bool)
     def on_connection_changed(self, connected: bool):
@@ -358,9 +404,8 @@ class OnyxMinerMainWindow(QMainWindow):
         self.control_panel.update_connection_status(connected)
         
         if connected:
+            # Config arrives with the refresh_all that made the connection
             self.log_panel.add_log_message("Connected to daemon")
-            # Reload config when connected
-            QTimer.singleShot(500, self.load_config)
         else:
             self.log_panel.add_log_message("Lost connection to daemon")
     
@@ -369,6 +414,17 @@ class OnyxMinerMainWindow(QMainWindow):
         """Handle error message"""
         self.log_panel.add_log_message(f"ERROR: {error_message}")
     
+    @pyqtSlot(str)
+    def on_mining_started(self, mode: str):
+        """Handle daemon accepting a start request"""
+        mode_name = "Background" if mode == "background" else "Money Hunter"
+        self.log_panel.add_log_message(f"{mode_name} mining started")
+    
+    @pyqtSlot()
+    def on_mining_stopped(self):
+        """Handle daemon confirming mining stopped"""
+        self.log_panel.add_log_message("Mining stopped")
+    
     def start_background_mining(self):
         """Start background mining"""
         self.start_mining("background")
@@ -393,9 +449,8 @@ class OnyxMinerMainWindow(QMainWindow):
         mode_name = "Background" if mode == "background" else "Money Hunter"
         self.log_panel.add_log_message(f"Starting {mode_name} mining...")
         
-        success = self.ipc_client.start_mining(mode)
-        if not success:
-            self.log_panel.add_log_message(f"Failed to start {mode_name} mining")
+        # Result arrives via mining_started / error_occurred
+        self._invoke_ipc("start_mining", Q_ARG(str, mode))
     
     def stop_mining(self):
         """Stop mining"""
@@ -405,29 +460,45 @@ class OnyxMinerMainWindow(QMainWindow):
         
         self.log_panel.add_log_message("Stopping mining...")
         
-        success = self.ipc_client.stop_mining()
-        if not success:
-            self.log_panel.add_log_message("Failed to stop mining")
+        # Result arrives via mining_stopped / error_occurred
+        self._invoke_ipc("stop_mining")
     
     def show_error(self, title: str, message: str):
         """Show error dialog"""
+        # Only needed on error paths - imported on first use
+        from PyQt6.QtWidgets import QMessageBox
+        
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle(title)
         msg_box.setText(message)
         msg_box.setIcon(QMessageBox.Icon.Warning)
-        msg_box.setStyleSheet(OnyxTheme.get_dialog_style())
         msg_box.exec()
     
+    def changeEvent(self, event):
+        """Poll less often while minimized"""
+        if event.type() == QEvent.Type.WindowStateChange:
+            interval = POLL_INTERVAL_MINIMIZED_MS if self.isMinimized() else POLL_INTERVAL_MS
+            self._invoke_ipc("set_poll_interval", Q_ARG(int, interval))
+        super().changeEvent(event)
+    
     def closeEvent(self, event):
         """Handle window close"""
         try:
             # Stop polling when window closes
-            self.ipc_client.stop_polling()
+            self._invoke_ipc("stop_polling")
             
             # Disconnect all signals to prevent orphaned connections
             self.ipc_client.status_updated.disconnect()
             self.ipc_client.connection_changed.disconnect()
             self.ipc_client.error_occurred.disconnect()
+            self.ipc_client.config_received.disconnect()
+            self.ipc_client.mining_started.disconnect()
+            self.ipc_client.mining_stopped.disconnect()
+            
+            # Release the persistent daemon connection and stop the IPC thread
+            QMetaObject.invokeMethod(self.ipc_client, "close", Qt.ConnectionType.BlockingQueuedConnection)
+            self._io_thread.quit()
+            self._io_thread.wait(2000)
             
             # Accept the close event
             event.accept()
@@ -4,12 +4,17 @@ Professional color scheme and styling for Onyx Monero GUI
 Onyx Digital Intelligence Development
 """
 
+from functools import lru_cache
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPalette, QColor
 from PyQt6.QtWidgets import QApplication
 
 class OnyxTheme:
-    """Onyx Arctic Terminal color scheme and styling"""
+    """Onyx Arctic Terminal color scheme and styling
+    
+    Stylesheet and palette getters are memoized - each variant is built once
+    per process.
+    """
     
     # Core Colors - Onyx Arctic Terminal
     BACKGROUND_MAIN = "#11151C"      # Near-black graphite
@@ -35,41 +40,56 @@ class OnyxTheme:
     FONT_FAMILY = "Arial"            # Clean sans-serif
     FONT_MONO = "Consolas"           # Monospace for logs
     
-    @staticmethod
-    def apply_to_app(app: QApplication):
-        """Apply Onyx theme to entire application"""
-        app.setStyle("Fusion")
-        
-        # Create dark palette
-        palette = QPalette()
-        
+    # Values of the "variant" (QPushButton) and "status" (QLabel) widget
+    # properties selected by the application stylesheet
+    BUTTON_VARIANTS = ("primary", "success", "danger", "secondary")
+    STATUS_TYPES = ("normal", "active", "error", "warning")
+    
+    # Dark palette: (color group, role, color)
+    PALETTE_COLORS = (
         # Window colors
-        palette.setColor(QPalette.ColorRole.Window, QColor(OnyxTheme.BACKGROUND_MAIN))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(OnyxTheme.TEXT_PRIMARY))
-        
+        (QPalette.ColorGroup.All, QPalette.ColorRole.Window, BACKGROUND_MAIN),
+        (QPalette.ColorGroup.All, QPalette.ColorRole.WindowText, TEXT_PRIMARY),
         # Base colors (input backgrounds)
-        palette.setColor(QPalette.ColorRole.Base, QColor(OnyxTheme.BACKGROUND_PANEL))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(OnyxTheme.BACKGROUND_CARD))
-        
+        (QPalette.ColorGroup.All, QPalette.ColorRole.Base, BACKGROUND_PANEL),
+        (QPalette.ColorGroup.All, QPalette.ColorRole.AlternateBase, BACKGROUND_CARD),
         # Text colors
-        palette.setColor(QPalette.ColorRole.Text, QColor(OnyxTheme.TEXT_PRIMARY))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(OnyxTheme.TEXT_PRIMARY))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(OnyxTheme.TEXT_PRIMARY))
-        
+        (QPalette.ColorGroup.All, QPalette.ColorRole.Text, TEXT_PRIMARY),
+        (QPalette.ColorGroup.All, QPalette.ColorRole.BrightText, TEXT_PRIMARY),
+        (QPalette.ColorGroup.All, QPalette.ColorRole.ButtonText, TEXT_PRIMARY),
         # Button colors
-        palette.setColor(QPalette.ColorRole.Button, QColor(OnyxTheme.BACKGROUND_PANEL))
-        
+        (QPalette.ColorGroup.All, QPalette.ColorRole.Button, BACKGROUND_PANEL),
         # Highlight colors
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(OnyxTheme.PRIMARY_ACCENT))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(OnyxTheme.TEXT_PRIMARY))
-        
+        (QPalette.ColorGroup.All, QPalette.ColorRole.Highlight, PRIMARY_ACCENT),
+        (QPalette.ColorGroup.All, QPalette.ColorRole.HighlightedText, TEXT_PRIMARY),
         # Disabled colors
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, QColor(OnyxTheme.TEXT_DISABLED))
-        palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, QColor(OnyxTheme.TEXT_DISABLED))
+        (QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text, TEXT_DISABLED),
+        (QPalette.ColorGroup.Disabled, QPalette.ColorRole.ButtonText, TEXT_DISABLED),
+    )
+    
+    @staticmethod
+    def apply_to_app(app: QApplication):
+        """Apply Onyx theme to entire application"""
+        app.setStyle("Fusion")
+        app.setStyleSheet(OnyxTheme.get_application_style())
+        app.setPalette(OnyxTheme.get_palette())
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_palette() -> QPalette:
+        """Get the dark application palette (shared - setPalette copies it)"""
+        palette = QPalette()
+        colors = {}
+        for group, role, value in OnyxTheme.PALETTE_COLORS:
+            color = colors.get(value)
+            if color is None:
+                color = colors[value] = QColor(value)
+            palette.setColor(group, role, color)
         
-        app.setPalette(palette)
+        return palette
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_button_style(variant: str = "primary") -> str:
         """Get button stylesheet for different variants"""
         base_style = f"""
@@ -151,6 +171,7 @@ class OnyxTheme:
             return base_style
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_panel_style() -> str:
         """Get panel/groupbox stylesheet"""
         return f"""
@@ -175,6 +196,7 @@ class OnyxTheme:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_status_label_style(status_type: str = "normal") -> str:
         """Get status label stylesheet"""
         base_style = f"""
@@ -220,6 +242,7 @@ class OnyxTheme:
             """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_log_panel_style() -> str:
         """Get log panel stylesheet"""
         return f"""
@@ -249,6 +272,7 @@ class OnyxTheme:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_main_window_style() -> str:
         """Get main window stylesheet"""
         return f"""
@@ -263,6 +287,7 @@ class OnyxTheme:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_input_style() -> str:
         """Get input field stylesheet"""
         return f"""
@@ -308,6 +333,50 @@ class OnyxTheme:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
+    def get_label_role_style() -> str:
+        """Get stylesheet for labels tagged with a "role" property"""
+        return f"""
+            QLabel[role="header"] {{
+                color: {OnyxTheme.PRIMARY_ACCENT};
+                padding: 8px 0;
+                border-bottom: 2px solid {OnyxTheme.BORDER_SUBTLE};
+                margin-bottom: 8px;
+            }}
+            QLabel[role="secondary"] {{
+                color: {OnyxTheme.TEXT_SECONDARY};
+            }}
+        """
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_application_style() -> str:
+        """Get the whole theme as one stylesheet
+        
+        Buttons pick a look with setProperty("variant", ...), status labels
+        with setProperty("status", ...), so Qt parses a single sheet instead
+        of one per widget.
+        """
+        parts = [
+            OnyxTheme.get_main_window_style(),
+            OnyxTheme.get_panel_style(),
+            OnyxTheme.get_log_panel_style(),
+            OnyxTheme.get_input_style(),
+            OnyxTheme.get_dialog_style(),
+            OnyxTheme.get_label_role_style(),
+        ]
+        parts += [
+            OnyxTheme.get_button_style(variant).replace("QPushButton", f'QPushButton[variant="{variant}"]')
+            for variant in OnyxTheme.BUTTON_VARIANTS
+        ]
+        parts += [
+            OnyxTheme.get_status_label_style(status).replace("QLabel", f'QLabel[status="{status}"]')
+            for status in OnyxTheme.STATUS_TYPES
+        ]
+        return "".join(parts)
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
     def get_dialog_style() -> str:
         """Get dialog window stylesheet"""
         return f"""
@@ -319,9 +388,14 @@ class OnyxTheme:
 
 # Font utilities
 class FontManager:
-    """Font management utilities"""
+    """Font management utilities
+    
+    Fonts are memoized and shared between widgets (setFont copies them);
+    copy with QFont(font) before modifying one.
+    """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_primary_font(size: int = 12, weight: int = 400) -> QFont:
         """Get primary UI font"""
         font = QFont(OnyxTheme.FONT_FAMILY, size)
@@ -329,12 +403,14 @@ class FontManager:
         return font
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_monospace_font(size: int = 11) -> QFont:
         """Get monospace font for logs/code"""
         font = QFont(OnyxTheme.FONT_MONO, size)
         return font
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_title_font(size: int = 16) -> QFont:
         """Get title font"""
         font = QFont(OnyxTheme.FONT_FAMILY, size)
@@ -37,7 +37,7 @@ def main():
     args = parser.parse_args()
     
     # Setup logging
-    setup_logging()
+    log_listener = setup_logging()
     
     logger.info("=" * 60)
     logger.info("Onyx Monero Mining Daemon - Starting")
@@ -46,7 +46,7 @@ def main():
     logger.info("=" * 60)
     
     # Create and start daemon
-    daemon = DaemonServer()
+    daemon = DaemonServer(log_listener)
     
     if not daemon.start():
         logger.error("Failed to start daemon")
@@ -4,72 +4,258 @@ Onyx Monero Mining Dashboard - Clean GUI
 Simple, functional interface for mining control
 """
 
+import os
 import sys
 import json
+import time
+import select
 import socket
 import logging
+from collections import deque
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                           QWidget, QPushButton, QLabel, QTextEdit, QFrame, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread
+                           QWidget, QPushButton, QLabel, QFrame)
+from PyQt6.QtCore import Qt, QTimer, QObject, QSocketNotifier, pyqtSignal
 from PyQt6.QtGui import QFont, QPalette, QColor
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # Optional C accelerator - fall back to stdlib json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-class MiningController(QThread):
-    """Background thread for daemon communication"""
+def json_dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def json_loads(data):
+    """Parse JSON from a bytes-like object (orjson reads views without copying)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+# Frames are a 4-byte big-endian length followed by a JSON payload
+FRAME_HEADER_SIZE = 4
+RECV_CHUNK_SIZE = 65536
+
+POLL_INTERVAL_MS = 3000
+# Seconds before an unanswered command marks the daemon as wedged
+COMMAND_TIMEOUT = 5
+STOP_TIMEOUT = 15  # stopping xmrig takes longer
+# How long a command result stays on screen
+TOAST_DURATION_MS = 3000
+# Seconds connect/send may block before the daemon is treated as wedged
+IO_BUDGET = 0.1
+
+def format_wallet(wallet):
+    """Shorten a wallet address to its first 20 and last 10 characters"""
+    if len(wallet) <= 30:
+        return wallet
+    return f"{wallet[:20]}...{wallet[-10:]}"
+
+def set_widget_state(widget, state):
+    """Set the "state" stylesheet property and re-polish the widget if it changed"""
+    if state != widget.property("state"):
+        widget.setProperty("state", state)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+
+def send_frame(sock, request):
+    """Send a length-prefixed JSON request on a non-blocking socket"""
+    payload = json_dumps(request)
+    data = memoryview(len(payload).to_bytes(FRAME_HEADER_SIZE, "big") + payload)
+    while data:
+        try:
+            sent = sock.send(data)
+        except BlockingIOError:
+            if not select.select([], [sock], [], IO_BUDGET)[1]:
+                raise TimeoutError("Daemon not accepting requests")
+            continue
+        data = data[sent:]
+
+class MiningController(QObject):
+    """Daemon communication driven by the Qt event loop
+    
+    Commands share one non-blocking socket; a QSocketNotifier wakes the
+    event loop when replies arrive, and the daemon answers in request order.
+    """
     status_updated = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.socket_path = Path.home() / ".onyx_monero" / "daemon.sock"
-        self.running = True
+        # Converted once; reconnects reuse the string
+        self._socket_path_str = os.fspath(self.socket_path)
         
-    def send_command(self, cmd, **kwargs):
-        """Send command to daemon"""
-        request = {"cmd": cmd, **kwargs}
+        self._sock = None
+        self._notifier = None
+        # Unparsed reply bytes, and a reusable buffer recv_into() fills
+        self._rx = bytearray()
+        self._recv_buf = bytearray(RECV_CHUNK_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+        # (callback, deadline) for each request awaiting its reply
+        self._pending = deque()
+        self._status_pending = False
+        
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_INTERVAL_MS)
+        self._timer.timeout.connect(self.poll)
+        
+        # Fires when the oldest pending request runs out of time
+        self._deadline_timer = QTimer(self)
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.timeout.connect(self._on_deadline)
+    
+    def start(self):
+        """Start status polling"""
+        self._timer.start()
+        self.poll()
+    
+    def stop(self):
+        """Stop polling and close the daemon connection"""
+        self._timer.stop()
+        self._deadline_timer.stop()
+        self._pending.clear()
+        self._status_pending = False
+        self._close_socket()
+    
+    def _connect(self):
+        """Open the persistent daemon connection"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(IO_BUDGET)
         try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect(str(self.socket_path))
-            sock.send(json.dumps(request).encode())
-            response = sock.recv(4096)
+            sock.connect(self._socket_path_str)
+        except OSError:
             sock.close()
-            return json.loads(response.decode())
-        except Exception as e:
-            return {"ok": False, "error": str(e)}
-    
-    def run(self):
-        """Background status polling"""
-        while self.running:
-            try:
-                response = self.send_command("ping")
-                if response.get("ok"):
-                    status = self.send_command("status")
-                    if status.get("ok"):
-                        self.status_updated.emit(status)
-                    else:
-                        self.error_occurred.emit("Status failed")
-                else:
-                    self.error_occurred.emit("Daemon not responding")
-            except Exception as e:
-                self.error_occurred.emit(f"Connection error: {e}")
-            
-            self.msleep(3000)  # Check every 3 seconds
+            raise
+        sock.setblocking(False)
+        self._sock = sock
+        self._notifier = QSocketNotifier(sock.fileno(), QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._on_readable)
     
-    def stop(self):
-        self.running = False
-        self.quit()
+    def _close_socket(self):
+        """Drop the connection; the next command reconnects"""
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._rx.clear()
+    
+    def _reset(self, error):
+        """Close the connection and fail every request still waiting on it"""
+        pending = self._pending
+        self._pending = deque()
+        self._deadline_timer.stop()
+        self._close_socket()
+        for callback, _ in pending:
+            callback({"ok": False, "error": error})
+    
+    def send_command(self, cmd, callback, timeout=COMMAND_TIMEOUT, **kwargs):
+        """Send command to daemon; callback receives the response dict"""
+        request = {"cmd": cmd, **kwargs}
+        try:
+            if self._sock is None:
+                self._connect()
+            send_frame(self._sock, request)
+        except OSError as e:
+            self._reset(str(e))
+            callback({"ok": False, "error": str(e)})
+            return
+        self._pending.append((callback, time.monotonic() + timeout))
+        if len(self._pending) == 1:
+            self._arm_deadline()
+    
+    def _arm_deadline(self):
+        """Point the deadline timer at the oldest pending request"""
+        if self._pending:
+            remaining = self._pending[0][1] - time.monotonic()
+            self._deadline_timer.start(max(0, int(remaining * 1000)))
+        else:
+            self._deadline_timer.stop()
+    
+    def _on_deadline(self):
+        """Give up on a daemon that stopped answering"""
+        if self._pending and time.monotonic() >= self._pending[0][1]:
+            self._reset("Daemon not responding")
+        else:
+            self._arm_deadline()
+    
+    def _on_readable(self):
+        """Read what the daemon sent and deliver complete replies"""
+        if self._sock is None:
+            return
+        try:
+            while True:
+                received = self._sock.recv_into(self._recv_buf)
+                if not received:
+                    self._reset("Daemon closed connection")
+                    return
+                self._rx += self._recv_view[:received]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            self._reset(str(e))
+            return
+        
+        # Pop every complete frame before running callbacks - a callback may
+        # open a dialog whose nested event loop re-enters this slot
+        rx = self._rx
+        replies = []
+        offset = 0
+        invalid = False
+        # Frames are parsed in place; the view is released before rx is trimmed
+        with memoryview(rx) as view:
+            while len(rx) - offset >= FRAME_HEADER_SIZE:
+                end = offset + FRAME_HEADER_SIZE + int.from_bytes(view[offset:offset + FRAME_HEADER_SIZE], "big")
+                if len(rx) < end:
+                    break
+                try:
+                    response = json_loads(view[offset + FRAME_HEADER_SIZE:end])
+                except ValueError:
+                    invalid = True
+                    break
+                offset = end
+                if self._pending:
+                    replies.append((self._pending.popleft()[0], response))
+        if invalid:
+            self._reset("Invalid response from daemon")
+            return
+        del rx[:offset]
+        if replies:
+            self._arm_deadline()
+        
+        for callback, response in replies:
+            callback(response)
+    
+    def poll(self):
+        """Timer tick: ask for status"""
+        # Keep at most one status request in flight
+        if not self._status_pending:
+            self._status_pending = True
+            self.send_command("status", self._on_status)
+    
+    def _on_status(self, status):
+        """A successful status reply doubles as the liveness check"""
+        self._status_pending = False
+        if status.get("ok"):
+            self.status_updated.emit(status)
+        else:
+            self.error_occurred.emit("Daemon not responding")
 
 class OnyxMiningGUI(QMainWindow):
     """Main mining control window"""
     
     def __init__(self):
         super().__init__()
-        self.controller = MiningController()
+        self.controller = MiningController(self)
         self.init_ui()
         self.setup_connections()
         self.controller.start()
@@ -90,6 +276,22 @@ class OnyxMiningGUI(QMainWindow):
             QPushButton:hover { background-color: #505050; }
             QPushButton:pressed { background-color: #303030; }
             QLabel { color: #ffffff; font-size: 12px; }
+            QLabel#statusLabel {
+                font-size: 14px;
+                margin: 5px;
+                padding: 10px;
+                background-color: #404040;
+                border-radius: 5px;
+            }
+            QLabel#statusLabel[state="active"] { background-color: #006400; }
+            QLabel#statusLabel[state="error"] { background-color: #8B0000; }
+            QLabel#toastLabel {
+                margin: 5px;
+                padding: 6px;
+                border-radius: 5px;
+                background-color: #006400;
+            }
+            QLabel#toastLabel[state="error"] { background-color: #8B0000; }
         """)
         
         # Central widget
@@ -107,7 +309,8 @@ class OnyxMiningGUI(QMainWindow):
         # Status display
         self.status_label = QLabel("Status: Connecting...")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.status_label.setStyleSheet("font-size: 14px; margin: 5px; padding: 10px; background-color: #404040; border-radius: 5px;")
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setProperty("state", "idle")
         layout.addWidget(self.status_label)
         
         # Mining info
@@ -136,6 +339,18 @@ class OnyxMiningGUI(QMainWindow):
         
         layout.addLayout(button_layout)
         
+        # Command results, shown briefly without blocking the event loop
+        self.toast_label = QLabel()
+        self.toast_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.toast_label.setObjectName("toastLabel")
+        self.toast_label.hide()
+        layout.addWidget(self.toast_label)
+        
+        self.toast_timer = QTimer(self)
+        self.toast_timer.setSingleShot(True)
+        self.toast_timer.setInterval(TOAST_DURATION_MS)
+        self.toast_timer.timeout.connect(self.toast_label.hide)
+        
         # Config info
         config_frame = QFrame()
         config_frame.setStyleSheet("QFrame { background-color: #404040; border-radius: 5px; margin: 10px; padding: 10px; }")
@@ -148,8 +363,8 @@ class OnyxMiningGUI(QMainWindow):
         
         try:
             config_path = Path.home() / ".onyx_monero" / "config.json"
-            with open(config_path) as f:
-                config = json.load(f)
+            with open(config_path, "rb") as f:
+                config = json_loads(f.read())
             
             wallet = config.get("wallet_address", "Not configured")
             pool = config.get("pool_url", "Not configured")
@@ -157,7 +372,7 @@ class OnyxMiningGUI(QMainWindow):
             
             config_layout.addWidget(QLabel(f"Pool: {pool}"))
             config_layout.addWidget(QLabel(f"Worker: {worker}"))
-            config_layout.addWidget(QLabel(f"Wallet: {wallet[:20]}...{wallet[-10:] if len(wallet) > 30 else wallet}"))
+            config_layout.addWidget(QLabel(f"Wallet: {format_wallet(wallet)}"))
             
         except Exception as e:
             config_layout.addWidget(QLabel(f"Config error: {e}"))
@@ -184,59 +399,61 @@ class OnyxMiningGUI(QMainWindow):
         
         if mining_active:
             self.status_label.setText(f"Status: Mining Active ({current_mode.title()})")
-            self.status_label.setStyleSheet("font-size: 14px; margin: 5px; padding: 10px; background-color: #006400; border-radius: 5px; color: white;")
+            set_widget_state(self.status_label, "active")
         else:
             self.status_label.setText("Status: Ready (Not Mining)")
-            self.status_label.setStyleSheet("font-size: 14px; margin: 5px; padding: 10px; background-color: #404040; border-radius: 5px; color: white;")
+            set_widget_state(self.status_label, "idle")
         
         self.mining_info.setText(f"Mode: {current_mode.title()} | Threads: {threads}/{total_threads}")
         
     def handle_error(self, error):
         """Handle communication errors"""
         self.status_label.setText(f"Status: Error - {error}")
-        self.status_label.setStyleSheet("font-size: 14px; margin: 5px; padding: 10px; background-color: #8B0000; border-radius: 5px; color: white;")
+        set_widget_state(self.status_label, "error")
     
-    def start_background(self):
-        """Start background mining"""
-        response = self.controller.send_command("start", mode="background")
+    def show_result(self, response, success, failure):
+        """Report the outcome of a control command in the toast label"""
         if response.get("ok"):
-            QMessageBox.information(self, "Success", "Background mining started!")
+            text, state = success, "ok"
         else:
-            QMessageBox.critical(self, "Error", f"Failed to start: {response.get('error', 'Unknown error')}")
+            text, state = f"{failure}: {response.get('error', 'Unknown error')}", "error"
+        
+        self.toast_label.setText(text)
+        set_widget_state(self.toast_label, state)
+        self.toast_label.show()
+        self.toast_timer.start()
+    
+    def start_background(self):
+        """Start background mining"""
+        self.controller.send_command(
+            "start",
+            lambda r: self.show_result(r, "Background mining started!", "Failed to start"),
+            mode="background"
+        )
     
     def start_money_hunter(self):
         """Start money hunter mining"""
-        response = self.controller.send_command("start", mode="money_hunter")
-        if response.get("ok"):
-            QMessageBox.information(self, "Success", "Money hunter mining started!")
-        else:
-            QMessageBox.critical(self, "Error", f"Failed to start: {response.get('error', 'Unknown error')}")
+        self.controller.send_command(
+            "start",
+            lambda r: self.show_result(r, "Money hunter mining started!", "Failed to start"),
+            mode="money_hunter"
+        )
     
     def stop_mining(self):
         """Stop mining"""
-        # Use direct socket call with longer timeout for stop command
-        try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(15)  # Longer timeout for stop
-            sock.connect(str(Path.home() / ".onyx_monero" / "daemon.sock"))
-            sock.send(json.dumps({"cmd": "stop"}).encode())
-            response = sock.recv(1024)
-            sock.close()
-            result = json.loads(response.decode())
-            if result.get("ok"):
-                QMessageBox.information(self, "Success", "Mining stopped!")
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to stop: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Stop failed: {e}")
+        self.controller.send_command(
+            "stop",
+            lambda r: self.show_result(r, "Mining stopped!", "Failed to stop"),
+            timeout=STOP_TIMEOUT
+        )
     
     def closeEvent(self, event):
         """Handle window close"""
         self.controller.stop()
-        self.controller.wait()
         event.accept()
 
 def main():
+    logging.basicConfig(level=logging.INFO)
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Modern look
     
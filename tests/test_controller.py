@@ -0,0 +1,104 @@
+"""
+Onyx Monero Daemon - XMrig controller tests
+Runs the controller against a stand-in xmrig script
+Onyx Digital Intelligence Development
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import daemon.config
+from daemon.config import ConfigManager, MiningConfig
+from daemon.controller import XMrigController
+from daemon.state import MinerState, MiningMode
+
+FAKE_XMRIG = """#!/bin/sh
+echo "speed 10s/60s/15m 123.4 n/a n/a H/s max 130.0 H/s"
+sleep "${FAKE_XMRIG_SLEEP:-0.2}"
+"""
+
+class XMrigControllerTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        xmrig = bin_dir / "xmrig"
+        xmrig.write_text(FAKE_XMRIG)
+        xmrig.chmod(0o755)
+
+        self.config_dir = root / ".onyx_monero"
+        for patcher in (
+            mock.patch.object(daemon.config, "_CONFIG_DIR", self.config_dir),
+            mock.patch.dict(os.environ, {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        config_manager = ConfigManager()
+        config_manager.ensure_config_dir()
+        self.controller = XMrigController(MinerState(), config_manager)
+        self.addCleanup(self.controller.shutdown)
+        self.config = MiningConfig(wallet_address="4" * 95)
+
+    def flusher_threads(self):
+        return [t for t in threading.enumerate() if t.name == "xmrig-log-flush"]
+
+    def test_log_closed_when_xmrig_exits(self):
+        self.assertTrue(self.controller.start_mining(MiningMode.BACKGROUND, self.config))
+        self.controller.monitor_thread.join(timeout=5)
+
+        self.assertIsNone(self.controller._log_fp)
+        log = (self.config_dir / "xmrig.log").read_bytes()
+        self.assertIn(b"123.4 n/a n/a H/s", log)
+
+        # One long-lived flusher, not a thread per tick
+        time.sleep(1.5)
+        self.assertEqual(len(self.flusher_threads()), 1)
+
+    def test_log_open_failure_does_not_spawn_xmrig(self):
+        # A directory in the way of xmrig.log makes the open fail
+        (self.config_dir / "xmrig.log").mkdir()
+        with mock.patch("subprocess.Popen") as popen:
+            self.assertFalse(self.controller.start_mining(MiningMode.BACKGROUND, self.config))
+        popen.assert_not_called()
+        self.assertFalse(self.controller.is_mining())
+        self.assertIn("Failed to start xmrig", self.controller.state.last_error)
+
+    def test_state_failure_kills_xmrig_and_closes_log(self):
+        spawned = []
+        popen = subprocess.Popen
+        def record_popen(*args, **kwargs):
+            spawned.append(popen(*args, **kwargs))
+            return spawned[-1]
+
+        with mock.patch.dict(os.environ, {"FAKE_XMRIG_SLEEP": "30"}), \
+                mock.patch("subprocess.Popen", side_effect=record_popen), \
+                mock.patch.object(self.controller.state, "start_mining", side_effect=RuntimeError("boom")):
+            self.assertFalse(self.controller.start_mining(MiningMode.BACKGROUND, self.config))
+
+        self.assertEqual(len(spawned), 1)
+        self.assertIsNotNone(spawned[0].returncode)
+        self.assertIsNone(self.controller.xmrig_process)
+        self.assertIsNone(self.controller._log_fp)
+
+    def test_shutdown_stops_flusher(self):
+        with mock.patch.dict(os.environ, {"FAKE_XMRIG_SLEEP": "30"}):
+            self.assertTrue(self.controller.start_mining(MiningMode.BACKGROUND, self.config))
+        self.assertTrue(self.controller.stop_mining("test"))
+        self.assertIsNone(self.controller._log_fp)
+
+        self.controller.shutdown()
+        self.assertEqual(self.flusher_threads(), [])
+
+if __name__ == "__main__":
+    unittest.main()
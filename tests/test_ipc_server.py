@@ -0,0 +1,238 @@
+"""
+Onyx Monero Daemon - IPC server tests
+Runs a real IPCServer on a temporary socket
+Onyx Digital Intelligence Development
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import daemon.config
+import daemon.server
+from daemon.config import ConfigManager, json_dumps, json_loads
+from daemon.controller import XMrigController
+from daemon.server import DaemonServer, IPCServer, FRAME_HEADER_SIZE
+from daemon.state import MinerState
+
+FAKE_XMRIG = """#!/bin/sh
+sleep 30
+"""
+
+def send_frame(sock: socket.socket, request: dict):
+    """Send a length-prefixed JSON request"""
+    payload = json_dumps(request)
+    sock.sendall(len(payload).to_bytes(FRAME_HEADER_SIZE, "big") + payload)
+
+def recv_frame(sock: socket.socket) -> dict:
+    """Receive a length-prefixed JSON response"""
+    def recv_exact(size):
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Daemon closed connection")
+            data += chunk
+        return data
+
+    length = int.from_bytes(recv_exact(FRAME_HEADER_SIZE), "big")
+    return json_loads(recv_exact(length))
+
+class IPCServerTestCase(unittest.TestCase):
+    """Base case: an IPCServer listening in a temporary config directory"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+        patcher = mock.patch.object(daemon.config, "_CONFIG_DIR", Path(self._tmp.name) / ".onyx_monero")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        config_manager = ConfigManager()
+        state = MinerState()
+        self.server = IPCServer(config_manager, state, XMrigController(state, config_manager))
+        self.assertTrue(self.server.start())
+        self.addCleanup(self.server.stop)
+
+    def connect(self, timeout: float = 3.0) -> socket.socket:
+        """Open a client connection to the test server"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(str(self.server.socket_path))
+        self.addCleanup(sock.close)
+        return sock
+
+    def request(self, request: dict) -> dict:
+        """Send one request on a fresh connection and return the reply"""
+        sock = self.connect()
+        send_frame(sock, request)
+        return recv_frame(sock)
+
+class PersistentConnectionTest(IPCServerTestCase):
+
+    def test_idle_connections_do_not_block_new_clients(self):
+        # More idle persistent connections than request workers
+        idle = []
+        for _ in range(12):
+            sock = self.connect()
+            send_frame(sock, {"cmd": "ping"})
+            self.assertTrue(recv_frame(sock)["ok"])
+            idle.append(sock)
+
+        self.assertTrue(self.request({"cmd": "ping"})["ok"])
+
+        # Idle connections keep serving requests
+        for sock in idle:
+            send_frame(sock, {"cmd": "status"})
+            self.assertTrue(recv_frame(sock)["ok"])
+
+class IdleTimeoutTest(IPCServerTestCase):
+
+    def setUp(self):
+        for name, value in (("CLIENT_IDLE_TIMEOUT", 0.2), ("IDLE_SWEEP_INTERVAL", 0.05)):
+            patcher = mock.patch.object(daemon.server, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_idle_connection_is_closed(self):
+        sock = self.connect()
+        send_frame(sock, {"cmd": "ping"})
+        self.assertTrue(recv_frame(sock)["ok"])
+
+        time.sleep(0.5)
+        self.assertEqual(sock.recv(1), b"")
+
+class ConfigSetTest(IPCServerTestCase):
+
+    WALLET = "4" * 95
+
+    def test_rejects_mistyped_fields(self):
+        self.assertTrue(self.request({"cmd": "config_set", "wallet_address": self.WALLET})["ok"])
+
+        for payload in ({"wallet_address": None}, {"use_ssl": "false"}, {"worker_name": 7}):
+            with self.subTest(payload=payload):
+                response = self.request({"cmd": "config_set", **payload})
+                self.assertFalse(response["ok"])
+                self.assertIn(next(iter(payload)), response["error"])
+
+        # Nothing was written
+        config = self.request({"cmd": "config_get"})["config"]
+        self.assertEqual(config["wallet_address"], self.WALLET)
+        self.assertIs(config["use_ssl"], True)
+        self.assertEqual(config["worker_name"], "onyx-miner")
+
+    def test_accepts_typed_fields(self):
+        response = self.request({"cmd": "config_set", "wallet_address": self.WALLET, "use_ssl": False})
+        self.assertTrue(response["ok"])
+        self.assertIs(self.request({"cmd": "config_get"})["config"]["use_ssl"], False)
+
+class SubscribeTest(IPCServerTestCase):
+
+    def test_closed_subscribers_release_server(self):
+        # More subscribers than request workers, all hanging up at once
+        for _ in range(10):
+            sock = self.connect()
+            send_frame(sock, {"cmd": "subscribe"})
+            self.assertTrue(recv_frame(sock)["ok"])
+            sock.close()
+
+        self.assertTrue(self.request({"cmd": "ping"})["ok"])
+
+        # Stream threads notice the hangup on their next wake
+        deadline = time.monotonic() + 3
+        while time.monotonic() < deadline:
+            if not any(t.name == "ipc-events" for t in threading.enumerate()):
+                break
+            time.sleep(0.1)
+        self.assertFalse(any(t.name == "ipc-events" for t in threading.enumerate()))
+
+    def test_subscriber_receives_state_change(self):
+        sock = self.connect()
+        send_frame(sock, {"cmd": "subscribe"})
+        rev = recv_frame(sock)["rev"]
+
+        self.server.state.set_error("boom")
+        event = recv_frame(sock)
+        self.assertEqual(event["evt"], "state_change")
+        self.assertNotEqual(event["rev"], rev)
+
+class DaemonShutdownTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        xmrig = bin_dir / "xmrig"
+        xmrig.write_text(FAKE_XMRIG)
+        xmrig.chmod(0o755)
+
+        # Record every xmrig spawned, and never touch the test runner's signals
+        self.spawned = []
+        popen = subprocess.Popen
+        def record_popen(*args, **kwargs):
+            self.spawned.append(popen(*args, **kwargs))
+            return self.spawned[-1]
+
+        for patcher in (
+            mock.patch.object(daemon.config, "_CONFIG_DIR", root / ".onyx_monero"),
+            mock.patch.dict(os.environ, {"PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}),
+            mock.patch("subprocess.Popen", side_effect=record_popen),
+            mock.patch("signal.signal"),
+            mock.patch("signal.set_wakeup_fd"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.kill_spawned)
+
+        self.daemon = DaemonServer()
+        self.addCleanup(os.close, self.daemon._signal_r)
+        self.addCleanup(os.close, self.daemon._signal_w)
+        self.assertTrue(self.daemon.start())
+
+    def kill_spawned(self):
+        for process in self.spawned:
+            if process.poll() is None:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+            process.stdout.close()
+
+    def request(self, request: dict) -> dict:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(3)
+            sock.connect(str(self.daemon.ipc_server.socket_path))
+            send_frame(sock, request)
+            return recv_frame(sock)
+
+    def test_shutdown_waits_for_in_flight_start(self):
+        self.assertTrue(self.request({"cmd": "config_set", "wallet_address": "4" * 95})["ok"])
+
+        # Hold the start on the control worker until shutdown has begun
+        generate = self.daemon.config_manager.generate_xmrig_config
+        def slow_generate(*args):
+            time.sleep(0.3)
+            return generate(*args)
+
+        with mock.patch.object(self.daemon.config_manager, "generate_xmrig_config", side_effect=slow_generate):
+            self.assertTrue(self.request({"cmd": "start", "mode": "background"})["ok"])
+            time.sleep(0.1)
+            self.daemon.shutdown()
+
+        miners = [process for process in self.spawned if "--config" in process.args]
+        self.assertEqual(len(miners), 1)
+        self.assertIsNotNone(miners[0].poll())
+        self.assertFalse(self.daemon.controller.is_mining())
+
+if __name__ == "__main__":
+    unittest.main()
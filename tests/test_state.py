@@ -0,0 +1,58 @@
+"""
+Onyx Monero Daemon - State tests
+Covers the cached system information helpers
+Onyx Digital Intelligence Development
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import daemon.state
+from daemon.state import SystemInfo, _ttl_cache
+
+class TTLCacheTest(unittest.TestCase):
+
+    def test_callers_get_their_own_copy(self):
+        cached = _ttl_cache(60)(lambda: {"cpu_percent": 1.0})
+
+        first = cached()
+        first["bundle"] = "extra"
+        self.assertEqual(cached(), {"cpu_percent": 1.0})
+
+    def test_concurrent_callers_share_one_refresh(self):
+        calls = []
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"calls": len(calls)}
+        cached = _ttl_cache(60)(slow)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cached())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"calls": 1}] * 8)
+
+class CPUSamplerTest(unittest.TestCase):
+
+    def test_sampler_keeps_a_fresh_reading(self):
+        with mock.patch.object(daemon.state, "CPU_SAMPLE_INTERVAL", 0.05), \
+                mock.patch.object(daemon.state.psutil, "cpu_percent", return_value=42.0) as cpu_percent:
+            SystemInfo.start_cpu_sampler()
+            self.addCleanup(SystemInfo.stop_cpu_sampler)
+            time.sleep(0.3)
+
+            self.assertGreater(cpu_percent.call_count, 2)
+            self.assertEqual(daemon.state._cpu_percent, 42.0)
+
+        SystemInfo.stop_cpu_sampler()
+        self.assertFalse(any(t.name == "cpu-sampler" for t in threading.enumerate()))
+
+if __name__ == "__main__":
+    unittest.main()